@@ -6,12 +6,55 @@ and monitors follow-through. Integrates with insurance verification for
 authorization requirements.
 """
 
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import secrets
+import weakref
 from datetime import datetime, timedelta
-from typing import Any, Optional, Literal
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count, islice
+from typing import Any, Callable, Optional, Literal
 from pydantic import BaseModel, Field
 from enum import Enum
 
+import httpx
+import numpy as np
+from structlog import get_logger
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+try:
+    from anthropic import APIConnectionError as AnthropicConnectionError
+    from anthropic import AsyncAnthropic
+    from anthropic import RateLimitError as AnthropicRateLimitError
+except ImportError:
+    AsyncAnthropic = None
+    AnthropicConnectionError = AnthropicRateLimitError = None
+
+try:
+    from openai import APIConnectionError as OpenAIConnectionError
+    from openai import AsyncOpenAI
+    from openai import RateLimitError as OpenAIRateLimitError
+except ImportError:
+    AsyncOpenAI = None
+    OpenAIConnectionError = OpenAIRateLimitError = None
+
 from platform_core.agents.base_agent import BaseAgent
+from platform_core.config import get_config
+from platform_core.shared_services.background_tasks import run_in_background
+from platform_core.shared_services.http_client import get_shared_http_client
+from platform_core.shared_services.semantic_cache import SemanticCache
+
+logger = get_logger()
 
 
 # ============================================================================
@@ -53,6 +96,7 @@ class SpecialistPreferences(BaseModel):
     location_preference: Optional[str] = None
     max_distance_miles: Optional[float] = None
     accepts_new_patients_only: bool = True
+    top_k: Optional[int] = Field(None, ge=1, description="Number of specialists to recommend")
 
 
 class ReferralManagementInput(BaseModel):
@@ -185,6 +229,535 @@ class ReferralManagementOutput(BaseModel):
     needs_human_review: bool
 
 
+# ============================================================================
+# Prompts
+# ============================================================================
+
+
+# Static instructions shared by every handoff request, sent as the system
+# prompt for both providers. Patient data always follows in the user message
+# (fixed field order) so providers can cache the prefix across referrals.
+# Anthropic and OpenAI only cache prefixes of at least 1024 tokens; the
+# few-shot examples keep this one above that (6,400 characters, roughly
+# 1,400 tokens).
+HANDOFF_SYSTEM_PROMPT = """You generate professional, concise clinical handoff summaries for specialist referrals.
+
+The user message contains the referral details: patient, referring provider, specialty needed,
+primary diagnosis, clinical question, relevant history, previous treatments, current medications
+and urgency.
+
+Please write a 2-3 paragraph clinical summary suitable for the specialist to review. Focus on:
+1. Chief complaint and clinical presentation
+2. Relevant history and previous treatments
+3. Specific reason for referral and clinical question
+
+Formatting rules:
+- Write in plain prose paragraphs; do not use headings, bullet points or markdown.
+- Refer to the patient by name once, then as "the patient".
+- Include diagnosis codes in parentheses after the diagnosis description.
+- Do not invent findings, test results or medications that are not in the referral details.
+- If a section has no information, omit it rather than speculating.
+- State the urgency explicitly when it is emergent or urgent.
+- Mention current medications only when they bear on the clinical question.
+- End with the clinical question, phrased as a request to the specialist.
+
+Examples of referral details and the summaries expected for them follow.
+
+Example 1 referral details:
+Patient: Jane Doe
+DOB: 1958-03-14
+
+Referring Provider: Dr. Alan Reyes, Internal Medicine
+
+Specialty Needed: Cardiology
+
+Primary Diagnosis: Unspecified atrial fibrillation (I48.91)
+
+Clinical Question: Is she a candidate for rhythm control or ablation?
+
+Relevant History: Intermittent palpitations and exertional dyspnea for three months; paroxysmal
+atrial fibrillation confirmed on ambulatory ECG monitoring. Hypertension.
+
+Previous Treatments: Metoprolol for rate control (six weeks), apixaban
+
+Current Medications: lisinopril 20 mg daily, metoprolol succinate 50 mg daily, apixaban 5 mg twice daily
+
+Urgency: routine
+
+Example 1 summary:
+Jane Doe is being referred to Cardiology for evaluation of atrial fibrillation (I48.91). She
+presented with intermittent palpitations and exertional dyspnea over the past three months, with
+paroxysmal atrial fibrillation confirmed on ambulatory ECG monitoring.
+
+The patient has a history of hypertension managed with lisinopril. Rate control with metoprolol
+was initiated six weeks ago with partial symptom improvement; anticoagulation with apixaban was
+started at the same time.
+
+We are requesting evaluation for rhythm control options, including candidacy for ablation, given
+persistent symptoms despite rate control.
+
+Example 2 referral details:
+Patient: Marcus Bell
+DOB: 1991-11-02
+
+Referring Provider: Dr. Priya Natarajan, Family Medicine
+
+Specialty Needed: Psychiatry
+
+Primary Diagnosis: Major depressive disorder, recurrent, moderate (F33.1)
+
+Clinical Question: Please advise on next-step pharmacotherapy after two failed SSRI trials.
+
+Relevant History: Third depressive episode since age 24. PHQ-9 of 17 at last visit, no suicidal
+ideation reported. Sleep disturbance and reduced appetite. Works night shifts.
+
+Previous Treatments: Sertraline up to 150 mg (12 weeks, partial response), escitalopram 20 mg (10
+weeks, no response), cognitive behavioral therapy (8 sessions)
+
+Current Medications: escitalopram 20 mg daily
+
+Urgency: routine
+
+Example 2 summary:
+Marcus Bell is being referred to Psychiatry for management of recurrent major depressive disorder,
+moderate (F33.1). This is his third depressive episode since age 24; his most recent PHQ-9 was 17,
+with sleep disturbance and reduced appetite, and he denied suicidal ideation. He works night
+shifts.
+
+The patient had a partial response to sertraline titrated to 150 mg over 12 weeks and no response
+to escitalopram 20 mg over 10 weeks, which he is currently taking. He also completed eight
+sessions of cognitive behavioral therapy.
+
+We would appreciate your advice on next-step pharmacotherapy after two SSRI trials with
+inadequate response.
+
+Example 3 referral details:
+Patient: Elena Petrova
+DOB: 1947-06-21
+
+Referring Provider: Dr. Samuel Okafor, Emergency Medicine
+
+Specialty Needed: Neurology
+
+Primary Diagnosis: Transient cerebral ischemic attack, unspecified (G45.9)
+
+Clinical Question: Please evaluate for stroke risk and secondary prevention within 24 hours.
+
+Relevant History: Twenty-minute episode of right arm weakness and word-finding difficulty this
+morning, fully resolved. CT head without acute findings. ABCD2 score of 5. Type 2 diabetes.
+
+Previous Treatments: None documented
+
+Current Medications: metformin 1000 mg twice daily, aspirin 81 mg daily (started today)
+
+Urgency: emergent
+
+Example 3 summary:
+Elena Petrova is being referred emergently to Neurology following a transient ischemic attack
+(G45.9). This morning she had a twenty-minute episode of right arm weakness and word-finding
+difficulty that resolved completely. CT of the head showed no acute findings, and her ABCD2 score
+is 5.
+
+The patient has type 2 diabetes treated with metformin. Aspirin 81 mg was started today; no
+other secondary prevention has been documented.
+
+Given the high early stroke risk, we are requesting neurological evaluation within 24 hours for
+stroke risk stratification and a secondary prevention plan.
+
+Example 4 referral details:
+Patient: David Kim
+DOB: 1979-09-30
+
+Referring Provider: Dr. Laura Chen, Primary Care
+
+Specialty Needed: Endocrinology
+
+Primary Diagnosis: Type 2 diabetes mellitus with hyperglycemia (E11.65)
+
+Clinical Question: Should basal insulin be started, or is a GLP-1 receptor agonist preferred?
+
+Relevant History: HbA1c rose from 8.1% to 9.4% over six months despite reported adherence. BMI
+34. eGFR 72. No history of pancreatitis.
+
+Previous Treatments: Metformin (four years), empagliflozin (one year), dietitian counseling
+
+Current Medications: See attached medication list
+
+Urgency: urgent
+
+Example 4 summary:
+David Kim is being referred urgently to Endocrinology for type 2 diabetes mellitus with
+hyperglycemia (E11.65). His HbA1c has risen from 8.1% to 9.4% over the past six months despite
+reported adherence; his BMI is 34 and eGFR is 72, with no history of pancreatitis.
+
+The patient has been treated with metformin for four years and empagliflozin for the past year,
+along with dietitian counseling.
+
+We are asking for your recommendation on intensifying therapy, specifically whether basal insulin
+should be started or a GLP-1 receptor agonist is preferred.
+
+Keep it professional, concise, and clinically relevant."""
+
+# Generated handoff summaries. The scope covers every prompt field except the
+# clinical question, so only paraphrases of the question can match
+_handoff_cache = SemanticCache(similarity_threshold=0.92, max_entries=10_000)
+
+
+# ============================================================================
+# Scoring Helpers
+# ============================================================================
+
+
+# Days within which a specialist should be available for each urgency
+URGENCY_AVAILABILITY_THRESHOLDS = {
+    ReferralUrgency.EMERGENT: 1,
+    ReferralUrgency.URGENT: 7,
+    ReferralUrgency.ROUTINE: 30,
+    ReferralUrgency.NON_URGENT: 90
+}
+
+# Target days to appointment for each urgency
+URGENCY_TARGET_DAYS = {
+    ReferralUrgency.EMERGENT: 1,
+    ReferralUrgency.URGENT: 7,
+    ReferralUrgency.ROUTINE: 30,
+    ReferralUrgency.NON_URGENT: 90
+}
+
+# Urgencies that need expedited handling
+URGENT_REFERRAL_URGENCIES = frozenset({ReferralUrgency.EMERGENT, ReferralUrgency.URGENT})
+
+# Note added to the clinical handoff for time-sensitive referrals
+URGENCY_HANDOFF_NOTES = {
+    ReferralUrgency.EMERGENT: "EMERGENT: This patient requires evaluation within 24 hours.",
+    ReferralUrgency.URGENT: "URGENT: This patient should be seen within 1 week."
+}
+
+
+@lru_cache(maxsize=64)
+def _calculate_timeline_cached(
+    urgency: ReferralUrgency,
+    requires_prior_auth: bool,
+    estimated_approval_time_days: Optional[int]
+) -> str:
+    """Build the referral timeline description"""
+
+    auth_days = estimated_approval_time_days if requires_prior_auth else 0
+
+    target_days = URGENCY_TARGET_DAYS[urgency]
+    total_days = auth_days + target_days
+
+    if requires_prior_auth:
+        return f"Estimated {total_days} days total ({auth_days} days for authorization + {target_days} days to appointment)"
+    else:
+        return f"Estimated {target_days} days to appointment"
+
+
+# Documents attached to every clinical handoff
+HANDOFF_STANDARD_DOCUMENTS = (
+    "Current medication list",
+    "Clinical notes from referring provider"
+)
+
+# Steps shared by every referral once a specialist is selected
+REFERRAL_COORDINATION_STEPS = (
+    "Send referral documentation to selected specialist",
+    "Coordinate appointment scheduling with patient",
+    "Monitor referral completion and specialist report"
+)
+
+# Leading next step for time-sensitive referrals
+URGENCY_STEP_PREFIX = {
+    urgency: (f"⚠️ {urgency.value.upper()} referral - expedite all steps",)
+    for urgency in URGENT_REFERRAL_URGENCIES
+}
+
+# Common specialties that typically require prior authorization
+HIGH_AUTH_SPECIALTIES = frozenset({
+    "cardiology", "neurology", "oncology", "orthopedic surgery",
+    "pain management", "psychiatry", "rheumatology", "surgery"
+})
+
+# Referral ID sequence. The random per-process prefix keeps IDs from different
+# workers (or restarts) apart; the counter keeps them unique within a process
+_referral_id_prefix = secrets.token_hex(4)
+_referral_sequence = count(1)
+
+# Maximum number of specialists returned per referral
+MAX_RECOMMENDED_SPECIALISTS = 5
+
+# Specialist match points (out of 100) by factor. Scores and match reasons are
+# both derived from the same factor buckets, so they cannot drift apart.
+INSURANCE_POINTS = 30.0
+NEW_PATIENT_POINTS = 20.0
+QUALITY_POINTS = 10.0  # scaled by rating / 5
+HIGH_QUALITY_RATING = 4.5
+
+# Availability buckets: within the urgency threshold, within 1.5x of it, later
+AVAILABILITY_POINTS = np.array([25.0, 15.0, 5.0])
+
+# Distance buckets with a preferred maximum: within it, within 1.5x of it, further
+PREFERRED_DISTANCE_POINTS = np.array([15.0, 8.0, 0.0])
+
+# Distance buckets without a preference: within 5 miles, within 15 miles, further
+DEFAULT_DISTANCE_LIMITS = (5.0, 15.0)
+DEFAULT_DISTANCE_POINTS = np.array([15.0, 10.0, 5.0])
+
+
+@dataclass(frozen=True)
+class SpecialistTable:
+    """Specialist directory stored column-wise for vectorized scoring"""
+    records: tuple[dict[str, Any], ...]
+    next_available: np.ndarray
+    distance: np.ndarray
+    quality: np.ndarray
+    accepts_insurance: np.ndarray
+    accepting_new: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, Any]]) -> "SpecialistTable":
+        """Build table from directory rows"""
+        return cls(
+            records=tuple(records),
+            next_available=np.array([r["next_available"] for r in records], dtype=np.int32),
+            distance=np.array([r["distance"] for r in records], dtype=np.float64),
+            quality=np.array([r.get("quality_rating", 4.0) for r in records], dtype=np.float64),
+            accepts_insurance=np.array([r["accepts_insurance"] for r in records], dtype=np.bool_),
+            accepting_new=np.array([r["accepting_new_patients"] for r in records], dtype=np.bool_)
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+def _bucket(values: np.ndarray, first_limit: float, second_limit: float) -> np.ndarray:
+    """Bucket index per value: 0 up to first_limit, 1 up to second_limit, else 2"""
+    return np.where(values <= first_limit, 0, np.where(values <= second_limit, 1, 2))
+
+
+@dataclass(frozen=True)
+class SpecialistScores:
+    """Match scores for a specialist table, with the factor buckets they were computed from"""
+    table: SpecialistTable
+    availability_threshold: int
+    preferred_distance: bool
+    availability_bucket: np.ndarray
+    distance_bucket: np.ndarray
+    scores: np.ndarray
+
+    def reasons(self, idx: int) -> list[str]:
+        """Match reasons for one specialist, from the same buckets as its score"""
+
+        table = self.table
+        reasons = []
+
+        if table.accepts_insurance[idx]:
+            reasons.append("Accepts patient's insurance")
+
+        if table.accepting_new[idx]:
+            reasons.append("Accepting new patients")
+
+        if self.availability_bucket[idx] == 0:
+            reasons.append(f"Available within {self.availability_threshold} days")
+        elif self.availability_bucket[idx] == 1:
+            reasons.append("Available within acceptable timeframe")
+
+        if self.distance_bucket[idx] == 0:
+            distance = float(table.distance[idx])
+            if self.preferred_distance:
+                reasons.append(f"Within preferred distance ({distance:.1f} miles)")
+            else:
+                reasons.append(f"Conveniently located ({distance:.1f} miles)")
+
+        quality = float(table.quality[idx])
+        if quality >= HIGH_QUALITY_RATING:
+            reasons.append(f"Highly rated ({quality}/5.0)")
+
+        return reasons
+
+
+def score_specialists(
+    table: SpecialistTable,
+    urgency: ReferralUrgency,
+    max_distance_miles: Optional[float]
+) -> SpecialistScores:
+    """Score every specialist in the table"""
+
+    threshold = URGENCY_AVAILABILITY_THRESHOLDS[urgency]
+    availability_bucket = _bucket(table.next_available, threshold, threshold * 1.5)
+
+    if max_distance_miles:
+        distance_bucket = _bucket(table.distance, max_distance_miles, max_distance_miles * 1.5)
+        distance_points = PREFERRED_DISTANCE_POINTS
+    else:
+        distance_bucket = _bucket(table.distance, *DEFAULT_DISTANCE_LIMITS)
+        distance_points = DEFAULT_DISTANCE_POINTS
+
+    score = INSURANCE_POINTS * table.accepts_insurance + NEW_PATIENT_POINTS * table.accepting_new
+    score += AVAILABILITY_POINTS[availability_bucket]
+    score += distance_points[distance_bucket]
+    score += (table.quality / 5.0) * QUALITY_POINTS
+
+    return SpecialistScores(
+        table=table,
+        availability_threshold=threshold,
+        preferred_distance=bool(max_distance_miles),
+        availability_bucket=availability_bucket,
+        distance_bucket=distance_bucket,
+        scores=np.minimum(score / 100.0, 1.0)
+    )
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties in directory order)"""
+
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+
+    # Partial selection is O(N). argpartition picks arbitrarily among scores tied
+    # with the k-th best, so keep everything above it and the earliest ties.
+    kth_score = -np.partition(-scores, k - 1)[k - 1]
+    above = np.flatnonzero(scores > kth_score)
+    tied = np.flatnonzero(scores == kth_score)[:k - len(above)]
+    candidates = np.concatenate((above, tied))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+# Mock specialist directory (specialty is filled in from the referral)
+MOCK_SPECIALIST_TABLE = SpecialistTable.from_records([
+    {
+        "specialist_id": "SPEC001",
+        "name": "Dr. Sarah Johnson",
+        "subspecialty": "Advanced Care",
+        "npi": "1234567890",
+        "practice_name": "Central Medical Specialists",
+        "address": "123 Medical Plaza, Suite 200",
+        "phone": "(555) 123-4567",
+        "fax": "(555) 123-4568",
+        "accepts_insurance": True,
+        "accepting_new_patients": True,
+        "next_available": 7,  # days
+        "distance": 2.3,
+        "quality_rating": 4.8
+    },
+    {
+        "specialist_id": "SPEC002",
+        "name": "Dr. Michael Chen",
+        "subspecialty": None,
+        "npi": "0987654321",
+        "practice_name": "University Health System",
+        "address": "456 Hospital Drive",
+        "phone": "(555) 234-5678",
+        "fax": "(555) 234-5679",
+        "accepts_insurance": True,
+        "accepting_new_patients": True,
+        "next_available": 14,  # days
+        "distance": 5.7,
+        "quality_rating": 4.9
+    },
+    {
+        "specialist_id": "SPEC003",
+        "name": "Dr. Emily Rodriguez",
+        "subspecialty": "Complex Cases",
+        "npi": "5555555555",
+        "practice_name": "Advanced Specialty Care",
+        "address": "789 Wellness Center",
+        "phone": "(555) 345-6789",
+        "fax": "(555) 345-6790",
+        "accepts_insurance": True,
+        "accepting_new_patients": True,
+        "next_available": 21,  # days
+        "distance": 12.1,
+        "quality_rating": 5.0
+    }
+])
+
+
+# ============================================================================
+# LLM Clients
+# ============================================================================
+
+
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Bounds in-flight handoff LLM calls across all referrals (including batches).
+# asyncio primitives are bound to one event loop, so each loop gets its own.
+_llm_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Get the handoff LLM semaphore for the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(get_config().llm_max_concurrency)
+    return semaphore
+
+
+# Retry policy for handoff LLM calls. The idle timeout bounds the wait for the
+# first chunk and between chunks (not the whole stream); only transient
+# provider errors are retried, and only before any text reached the caller.
+LLM_MAX_ATTEMPTS = 3
+LLM_IDLE_TIMEOUT_SECONDS = 30
+RETRYABLE_LLM_ERRORS = tuple(
+    error for error in (
+        TimeoutError,
+        httpx.TimeoutException,
+        AnthropicConnectionError,
+        AnthropicRateLimitError,
+        OpenAIConnectionError,
+        OpenAIRateLimitError
+    )
+    if error is not None
+)
+
+
+def _llm_retrying(can_retry: Callable[[], bool] = lambda: True) -> AsyncRetrying:
+    """Create retry controller for a handoff LLM call (can_retry vetoes retries)"""
+    return AsyncRetrying(
+        stop=stop_after_attempt(LLM_MAX_ATTEMPTS),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception_type(RETRYABLE_LLM_ERRORS) & retry_if_exception(lambda _: can_retry()),
+        reraise=True
+    )
+
+
+def _reset_idle_timeout(timeout: asyncio.Timeout) -> None:
+    """Restart the idle timer after a streamed chunk"""
+    timeout.reschedule(asyncio.get_running_loop().time() + LLM_IDLE_TIMEOUT_SECONDS)
+
+
+def _get_anthropic_client() -> Optional["AsyncAnthropic"]:
+    """Get the shared Anthropic client (None if the SDK is not installed)"""
+    if AsyncAnthropic is None:
+        return None
+    return _anthropic_client_for(get_shared_http_client())
+
+
+def _get_openai_client() -> Optional["AsyncOpenAI"]:
+    """Get the shared OpenAI client (None if the SDK is not installed)"""
+    if AsyncOpenAI is None:
+        return None
+    return _openai_client_for(get_shared_http_client())
+
+
+# Keyed on the shared HTTP client, so a client recreated after
+# close_shared_http_client() gets fresh SDK clients instead of closed ones
+@lru_cache(maxsize=1)
+def _anthropic_client_for(http_client: httpx.AsyncClient) -> "AsyncAnthropic":
+    """Build the Anthropic client for a shared HTTP client"""
+    return AsyncAnthropic(api_key=ANTHROPIC_API_KEY, http_client=http_client, max_retries=0)
+
+
+@lru_cache(maxsize=1)
+def _openai_client_for(http_client: httpx.AsyncClient) -> "AsyncOpenAI":
+    """Build the OpenAI client for a shared HTTP client"""
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client, max_retries=0)
+
+
 # ============================================================================
 # Agent Implementation
 # ============================================================================
@@ -211,21 +784,15 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
         super().__init__()
         self.llm_provider = llm_provider
 
-        # Initialize LLM clients
-        if llm_provider == "anthropic":
-            try:
-                from anthropic import AsyncAnthropic
-                import os
-                self.anthropic_client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            except ImportError:
-                self.anthropic_client = None
-        else:
-            try:
-                from openai import AsyncOpenAI
-                import os
-                self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            except ImportError:
-                self.openai_client = None
+    @property
+    def anthropic_client(self) -> Optional["AsyncAnthropic"]:
+        """Process-wide Anthropic client on the live shared connection pool"""
+        return _get_anthropic_client() if self.llm_provider == "anthropic" else None
+
+    @property
+    def openai_client(self) -> Optional["AsyncOpenAI"]:
+        """Process-wide OpenAI client on the live shared connection pool"""
+        return _get_openai_client() if self.llm_provider != "anthropic" else None
 
     async def _execute_internal(
         self,
@@ -243,6 +810,27 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
         else:
             raise ValueError(f"Unknown action: {input_data.action}")
 
+    async def batch_execute(
+        self,
+        inputs: list[ReferralManagementInput],
+        max_concurrency: int = 8
+    ) -> list[ReferralManagementOutput | BaseException]:
+        """
+        Process many referrals concurrently.
+
+        At most max_concurrency referrals run at once; LLM calls are further
+        bounded by the shared LLM semaphore. Results are returned in input
+        order, with failed referrals returned as their exception.
+        """
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run(input_data: ReferralManagementInput) -> ReferralManagementOutput:
+            async with semaphore:
+                return await self._execute_internal(input_data, {})
+
+        return await asyncio.gather(*(_run(i) for i in inputs), return_exceptions=True)
+
     async def _create_referral(
         self,
         input_data: ReferralManagementInput,
@@ -250,17 +838,30 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
     ) -> ReferralManagementOutput:
         """Create new referral"""
 
-        # Step 1: Generate referral ID
-        referral_id = f"REF-{input_data.patient_id[:8]}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-
-        # Step 2: Find matching specialists
-        specialists = await self._find_matching_specialists(input_data)
+        now = datetime.now()
 
-        # Step 3: Check authorization requirements
-        auth_requirements = await self._check_authorization_requirements(input_data)
+        # Step 1: Generate referral ID
+        referral_id = f"REF-{input_data.patient_id[:8]}-{_referral_id_prefix}{next(_referral_sequence):x}"
+
+        # Steps 2-4: Find matching specialists, check authorization requirements
+        # and generate clinical handoff documentation. These are independent,
+        # so run them concurrently; total latency is bounded by the LLM call.
+        specialists, auth_requirements, clinical_handoff = await asyncio.gather(
+            self._find_matching_specialists(input_data, now),
+            self._check_authorization_requirements(input_data),
+            self._generate_clinical_handoff(input_data, context.get("on_token")),
+            return_exceptions=True
+        )
 
-        # Step 4: Generate clinical handoff documentation
-        clinical_handoff = await self._generate_clinical_handoff(input_data)
+        if isinstance(specialists, BaseException):
+            raise specialists
+        if isinstance(auth_requirements, BaseException):
+            raise auth_requirements
+        if isinstance(clinical_handoff, BaseException):
+            # Fallback to template-based handoff
+            clinical_handoff = self._build_clinical_handoff(
+                input_data, self._generate_handoff_template(input_data)
+            )
 
         # Step 5: Determine next steps
         next_steps = self._determine_next_steps(input_data, auth_requirements, specialists)
@@ -283,7 +884,7 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
             tracking=None,  # Will be created after specialist selected
             next_steps=next_steps,
             estimated_timeline=timeline,
-            requires_urgent_attention=(input_data.urgency in [ReferralUrgency.EMERGENT, ReferralUrgency.URGENT]),
+            requires_urgent_attention=(input_data.urgency in URGENT_REFERRAL_URGENCIES),
             missing_information=missing_info,
             confidence=confidence,
             needs_human_review=(confidence < 0.8 or len(missing_info) > 0)
@@ -291,74 +892,38 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
 
     async def _find_matching_specialists(
         self,
-        input_data: ReferralManagementInput
+        input_data: ReferralManagementInput,
+        now: Optional[datetime] = None
     ) -> list[SpecialistMatch]:
         """Find specialists matching patient needs"""
 
         # In production, this would query a specialist directory database
-        # For now, return mock specialists with realistic matching logic
-
-        mock_specialists = [
-            {
-                "specialist_id": "SPEC001",
-                "name": "Dr. Sarah Johnson",
-                "specialty": input_data.specialty_needed,
-                "subspecialty": "Advanced Care",
-                "npi": "1234567890",
-                "practice_name": "Central Medical Specialists",
-                "address": "123 Medical Plaza, Suite 200",
-                "phone": "(555) 123-4567",
-                "fax": "(555) 123-4568",
-                "accepts_insurance": True,
-                "accepting_new_patients": True,
-                "next_available": 7,  # days
-                "distance": 2.3,
-                "quality_rating": 4.8
-            },
-            {
-                "specialist_id": "SPEC002",
-                "name": "Dr. Michael Chen",
-                "specialty": input_data.specialty_needed,
-                "subspecialty": None,
-                "npi": "0987654321",
-                "practice_name": "University Health System",
-                "address": "456 Hospital Drive",
-                "phone": "(555) 234-5678",
-                "fax": "(555) 234-5679",
-                "accepts_insurance": True,
-                "accepting_new_patients": True,
-                "next_available": 14,  # days
-                "distance": 5.7,
-                "quality_rating": 4.9
-            },
-            {
-                "specialist_id": "SPEC003",
-                "name": "Dr. Emily Rodriguez",
-                "specialty": input_data.specialty_needed,
-                "subspecialty": "Complex Cases",
-                "npi": "5555555555",
-                "practice_name": "Advanced Specialty Care",
-                "address": "789 Wellness Center",
-                "phone": "(555) 345-6789",
-                "fax": "(555) 345-6790",
-                "accepts_insurance": True,
-                "accepting_new_patients": True,
-                "next_available": 21,  # days
-                "distance": 12.1,
-                "quality_rating": 5.0
-            }
-        ]
+        # For now, score the mock directory with realistic matching logic
+
+        table = MOCK_SPECIALIST_TABLE
+        prefs = input_data.specialist_preferences
+        scored = score_specialists(
+            table,
+            input_data.urgency,
+            prefs.max_distance_miles if prefs else None
+        )
+
+        # Only materialize the top matches, best first
+        top_k = (prefs.top_k if prefs else None) or MAX_RECOMMENDED_SPECIALISTS
+        top_indices = top_k_indices(scored.scores, top_k)
+
+        now = now or datetime.now()
 
         specialists = []
-        for spec in mock_specialists:
-            score, reasons = self._score_specialist_match(spec, input_data)
+        for idx in top_indices:
+            spec = table.records[idx]
 
-            next_available_date = (datetime.now() + timedelta(days=spec["next_available"])).strftime("%Y-%m-%d")
+            next_available_date = (now + timedelta(days=spec["next_available"])).date().isoformat()
 
             specialists.append(SpecialistMatch(
                 specialist_id=spec["specialist_id"],
                 name=spec["name"],
-                specialty=spec["specialty"],
+                specialty=input_data.specialty_needed,
                 subspecialty=spec["subspecialty"],
                 npi=spec["npi"],
                 practice_name=spec["practice_name"],
@@ -370,86 +935,12 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
                 next_available_appointment=next_available_date,
                 average_wait_time_days=spec["next_available"],
                 distance_miles=spec["distance"],
-                match_score=score,
-                match_reasons=reasons
+                match_score=float(scored.scores[idx]),
+                match_reasons=scored.reasons(idx)
             ))
 
-        # Sort by match score
-        specialists.sort(key=lambda x: x.match_score, reverse=True)
-
         return specialists
 
-    def _score_specialist_match(
-        self,
-        specialist: dict[str, Any],
-        input_data: ReferralManagementInput
-    ) -> tuple[float, list[str]]:
-        """Score how well specialist matches patient needs"""
-
-        score = 0.0
-        reasons = []
-        max_score = 100.0
-
-        # Factor 1: Insurance acceptance (30 points)
-        if specialist["accepts_insurance"]:
-            score += 30
-            reasons.append("Accepts patient's insurance")
-
-        # Factor 2: Accepting new patients (20 points)
-        if specialist["accepting_new_patients"]:
-            score += 20
-            reasons.append("Accepting new patients")
-
-        # Factor 3: Availability vs urgency (25 points)
-        days_available = specialist["next_available"]
-        urgency_thresholds = {
-            ReferralUrgency.EMERGENT: 1,
-            ReferralUrgency.URGENT: 7,
-            ReferralUrgency.ROUTINE: 30,
-            ReferralUrgency.NON_URGENT: 90
-        }
-        threshold = urgency_thresholds[input_data.urgency]
-
-        if days_available <= threshold:
-            score += 25
-            reasons.append(f"Available within {threshold} days")
-        elif days_available <= threshold * 1.5:
-            score += 15
-            reasons.append(f"Available within acceptable timeframe")
-        else:
-            score += 5
-
-        # Factor 4: Distance (15 points)
-        distance = specialist["distance"]
-        prefs = input_data.specialist_preferences
-
-        if prefs and prefs.max_distance_miles:
-            if distance <= prefs.max_distance_miles:
-                score += 15
-                reasons.append(f"Within preferred distance ({distance:.1f} miles)")
-            elif distance <= prefs.max_distance_miles * 1.5:
-                score += 8
-        else:
-            # Default: prefer closer
-            if distance <= 5:
-                score += 15
-                reasons.append(f"Conveniently located ({distance:.1f} miles)")
-            elif distance <= 15:
-                score += 10
-            else:
-                score += 5
-
-        # Factor 5: Quality rating (10 points)
-        quality = specialist.get("quality_rating", 4.0)
-        score += (quality / 5.0) * 10
-        if quality >= 4.5:
-            reasons.append(f"Highly rated ({quality}/5.0)")
-
-        # Normalize to 0-1
-        normalized_score = min(score / max_score, 1.0)
-
-        return normalized_score, reasons
-
     async def _check_authorization_requirements(
         self,
         input_data: ReferralManagementInput
@@ -462,23 +953,18 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
         insurance_plan = input_data.patient_insurance.get("plan_type", "unknown").lower()
         specialty = input_data.specialty_needed.lower()
 
-        # Common specialties that typically require auth
-        high_auth_specialties = [
-            "cardiology", "neurology", "oncology", "orthopedic surgery",
-            "pain management", "psychiatry", "rheumatology", "surgery"
-        ]
-
         requires_auth = (
             "hmo" in insurance_plan or
             "medicaid" in insurance_plan or
-            any(s in specialty for s in high_auth_specialties)
+            specialty in HIGH_AUTH_SPECIALTIES or
+            any(s in specialty for s in HIGH_AUTH_SPECIALTIES)
         )
 
         if requires_auth:
             # Estimate approval probability based on diagnosis and urgency
             approval_prob = 0.85  # Base probability
 
-            if input_data.urgency in [ReferralUrgency.EMERGENT, ReferralUrgency.URGENT]:
+            if input_data.urgency in URGENT_REFERRAL_URGENCIES:
                 approval_prob = 0.95  # Higher for urgent cases
 
             if len(input_data.referral_reason.previous_treatments) > 0:
@@ -519,42 +1005,98 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
 
     async def _generate_clinical_handoff(
         self,
-        input_data: ReferralManagementInput
+        input_data: ReferralManagementInput,
+        on_token: Optional[Callable[[str], Any]] = None
     ) -> ClinicalHandoff:
-        """Generate clinical handoff documentation for specialist"""
+        """
+        Generate clinical handoff documentation for specialist
+
+        If on_token is given (sync or async), it receives the LLM summary text
+        as it streams in, before the full handoff is assembled.
+        """
+
+        # Reuse a previous summary for the same referral with a reworded question
+        cache_key = input_data.referral_reason.clinical_question
+        cache_scope = self._handoff_cache_scope(input_data)
+        summary = await _handoff_cache.get(cache_key, scope=cache_scope)
+        if summary is not None:
+            # Streaming callers still receive the summary text, in one chunk
+            await self._emit_token(on_token, summary)
+            return self._build_clinical_handoff(input_data, summary)
 
         # Use LLM to generate comprehensive handoff summary
-        if self.llm_provider == "anthropic" and self.anthropic_client:
-            summary = await self._generate_handoff_with_anthropic(input_data)
-        elif self.llm_provider == "openai" and self.openai_client:
-            summary = await self._generate_handoff_with_openai(input_data)
-        else:
-            # Fallback to template-based
-            summary = self._generate_handoff_template(input_data)
+        try:
+            if self.llm_provider == "anthropic" and self.anthropic_client:
+                summary = await self._generate_handoff_with_anthropic(input_data, on_token)
+            elif self.llm_provider == "openai" and self.openai_client:
+                summary = await self._generate_handoff_with_openai(input_data, on_token)
+            else:
+                summary = None
+        except Exception:
+            # Retries exhausted or non-transient error
+            summary = None
+
+        if summary is None:
+            # Fallback to template-based (not cached)
+            return self._build_clinical_handoff(input_data, self._generate_handoff_template(input_data))
+
+        await _handoff_cache.set(cache_key, summary, scope=cache_scope)
+
+        return self._build_clinical_handoff(input_data, summary)
+
+    def _handoff_cache_scope(self, input_data: ReferralManagementInput) -> str:
+        """
+        Build the handoff cache scope for a referral.
+
+        Covers the provider, patient and every other field of the handoff prompt
+        except the clinical question, which is matched semantically.
+        """
+        prompt_fields = input_data.model_dump(
+            mode="json",
+            include={
+                "patient_id": True,
+                "patient_name": True,
+                "patient_dob": True,
+                "referring_provider": {"name", "specialty"},
+                "specialty_needed": True,
+                "referral_reason": {
+                    "primary_diagnosis",
+                    "diagnosis_description",
+                    "relevant_history",
+                    "previous_treatments"
+                },
+                "current_medications": True,
+                "urgency": True
+            }
+        )
+        scope_data = [self.llm_provider, prompt_fields]
+        return hashlib.sha256(json.dumps(scope_data, sort_keys=True).encode()).hexdigest()
 
-        # Extract relevant findings
-        findings = []
-        if input_data.referral_reason.relevant_history:
-            findings.append(input_data.referral_reason.relevant_history)
+    def _build_clinical_handoff(
+        self,
+        input_data: ReferralManagementInput,
+        summary: str
+    ) -> ClinicalHandoff:
+        """Assemble clinical handoff around a generated summary"""
 
-        if input_data.referral_reason.previous_treatments:
-            findings.append(f"Previous treatments: {', '.join(input_data.referral_reason.previous_treatments)}")
+        reason = input_data.referral_reason
+
+        # Extract relevant findings
+        findings = [reason.relevant_history] if reason.relevant_history else []
+        if reason.previous_treatments:
+            findings.append(f"Previous treatments: {', '.join(reason.previous_treatments)}")
 
         # Documents being attached
-        documents = []
-        if input_data.relevant_lab_results:
-            documents.append(f"{len(input_data.relevant_lab_results)} lab result(s)")
+        documents = (
+            [f"{len(input_data.relevant_lab_results)} lab result(s)"]
+            if input_data.relevant_lab_results else []
+        )
         if input_data.relevant_imaging:
             documents.append(f"{len(input_data.relevant_imaging)} imaging study(ies)")
-        documents.append("Current medication list")
-        documents.append("Clinical notes from referring provider")
+        documents.extend(HANDOFF_STANDARD_DOCUMENTS)
 
         # Urgency note
-        urgency_note = None
-        if input_data.urgency == ReferralUrgency.EMERGENT:
-            urgency_note = "EMERGENT: This patient requires evaluation within 24 hours."
-        elif input_data.urgency == ReferralUrgency.URGENT:
-            urgency_note = "URGENT: This patient should be seen within 1 week."
+        urgency_note = URGENCY_HANDOFF_NOTES.get(input_data.urgency)
 
         return ClinicalHandoff(
             referral_summary=summary,
@@ -566,14 +1108,45 @@ class ReferralManagementAgent(BaseAgent[ReferralManagementInput, ReferralManagem
         )
 
     async def _generate_handoff_with_anthropic(
+        self,
+        input_data: ReferralManagementInput,
+        on_token: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Generate handoff summary using Anthropic Claude (retries transient errors)"""
+
+        # Text already forwarded to on_token cannot be taken back, so retry only before that
+        chunks: list[str] = []
+        async for attempt in _llm_retrying(lambda: on_token is None or not chunks):
+            with attempt:
+                chunks.clear()
+                async with _get_llm_semaphore(), asyncio.timeout(LLM_IDLE_TIMEOUT_SECONDS) as idle_timeout:
+                    async with self.anthropic_client.messages.stream(
+                        model="claude-3-5-sonnet-20241022",
+                        max_tokens=800,
+                        temperature=0.3,
+                        system=[
+                            {
+                                "type": "text",
+                                "text": HANDOFF_SYSTEM_PROMPT,
+                                "cache_control": {"type": "ephemeral"}
+                            }
+                        ],
+                        messages=[{"role": "user", "content": self._format_handoff_patient_data(input_data)}]
+                    ) as stream:
+                        async for text in stream.text_stream:
+                            chunks.append(text)
+                            await self._emit_token(on_token, text)
+                            _reset_idle_timeout(idle_timeout)
+
+        return "".join(chunks).strip()
+
+    def _format_handoff_patient_data(
         self,
         input_data: ReferralManagementInput
     ) -> str:
-        """Generate handoff summary using Anthropic Claude"""
-
-        prompt = f"""Generate a professional, concise clinical handoff summary for a specialist referral.
+        """Format the referral-specific portion of the handoff prompt"""
 
-Patient: {input_data.patient_name}
+        return f"""Patient: {input_data.patient_name}
 DOB: {input_data.patient_dob}
 
 Referring Provider: {input_data.referring_provider.name}, {input_data.referring_provider.specialty}
@@ -590,69 +1163,59 @@ Previous Treatments: {', '.join(input_data.referral_reason.previous_treatments)
 
 Current Medications: {', '.join(input_data.current_medications) if input_data.current_medications else 'See attached medication list'}
 
-Urgency: {input_data.urgency.value}
-
-Please write a 2-3 paragraph clinical summary suitable for the specialist to review. Focus on:
-1. Chief complaint and clinical presentation
-2. Relevant history and previous treatments
-3. Specific reason for referral and clinical question
-
-Keep it professional, concise, and clinically relevant."""
-
-        try:
-            response = await self.anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=800,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            return response.content[0].text.strip()
-        except Exception as e:
-            # Fallback to template
-            return self._generate_handoff_template(input_data)
+Urgency: {input_data.urgency.value}"""
 
     async def _generate_handoff_with_openai(
         self,
-        input_data: ReferralManagementInput
+        input_data: ReferralManagementInput,
+        on_token: Optional[Callable[[str], Any]] = None
     ) -> str:
-        """Generate handoff summary using OpenAI"""
-
-        prompt = f"""Generate a professional, concise clinical handoff summary for a specialist referral.
-
-Patient: {input_data.patient_name}
-DOB: {input_data.patient_dob}
-
-Referring Provider: {input_data.referring_provider.name}, {input_data.referring_provider.specialty}
-
-Specialty Needed: {input_data.specialty_needed}
-
-Primary Diagnosis: {input_data.referral_reason.diagnosis_description} ({input_data.referral_reason.primary_diagnosis})
-
-Clinical Question: {input_data.referral_reason.clinical_question}
-
-Relevant History: {input_data.referral_reason.relevant_history}
-
-Previous Treatments: {', '.join(input_data.referral_reason.previous_treatments) if input_data.referral_reason.previous_treatments else 'None documented'}
-
-Current Medications: {', '.join(input_data.current_medications) if input_data.current_medications else 'See attached medication list'}
-
-Urgency: {input_data.urgency.value}
+        """Generate handoff summary using OpenAI (retries transient errors)"""
+
+        # Static instructions first so OpenAI's automatic prefix caching applies (the
+        # system prompt is over its 1024-token minimum); the stable prompt_cache_key
+        # routes every handoff request to the same cache
+        messages = [
+            {"role": "system", "content": HANDOFF_SYSTEM_PROMPT},
+            {"role": "user", "content": self._format_handoff_patient_data(input_data)}
+        ]
 
-Please write a 2-3 paragraph clinical summary suitable for the specialist to review."""
+        # Text already forwarded to on_token cannot be taken back, so retry only before that
+        chunks: list[str] = []
+        async for attempt in _llm_retrying(lambda: on_token is None or not chunks):
+            with attempt:
+                chunks.clear()
+                async with _get_llm_semaphore(), asyncio.timeout(LLM_IDLE_TIMEOUT_SECONDS) as idle_timeout:
+                    stream = await self.openai_client.chat.completions.create(
+                        model="gpt-4-turbo-preview",
+                        messages=messages,
+                        max_tokens=800,
+                        temperature=0.3,
+                        extra_body={"prompt_cache_key": "referral_handoff:v1"},
+                        stream=True
+                    )
+                    async for chunk in stream:
+                        text = chunk.choices[0].delta.content if chunk.choices else None
+                        if text:
+                            chunks.append(text)
+                            await self._emit_token(on_token, text)
+                        _reset_idle_timeout(idle_timeout)
+
+        return "".join(chunks).strip()
+
+    async def _emit_token(
+        self,
+        on_token: Optional[Callable[[str], Any]],
+        text: str
+    ) -> None:
+        """Forward a streamed text chunk to the caller's callback"""
 
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.3
-            )
+        if on_token is None:
+            return
 
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            # Fallback to template
-            return self._generate_handoff_template(input_data)
+        result = on_token(text)
+        if inspect.isawaitable(result):
+            await result
 
     def _generate_handoff_template(
         self,
@@ -660,25 +1223,28 @@ Please write a 2-3 paragraph clinical summary suitable for the specialist to rev
     ) -> str:
         """Generate handoff using template (fallback)"""
 
-        summary = f"""REFERRAL SUMMARY
-
-Patient {input_data.patient_name} is being referred to {input_data.specialty_needed} for evaluation of {input_data.referral_reason.diagnosis_description} ({input_data.referral_reason.primary_diagnosis}).
-
-{input_data.referral_reason.relevant_history}
-
-"""
+        reason = input_data.referral_reason
+        parts = [
+            "REFERRAL SUMMARY\n\n",
+            f"Patient {input_data.patient_name} is being referred to {input_data.specialty_needed} "
+            f"for evaluation of {reason.diagnosis_description} ({reason.primary_diagnosis}).\n\n",
+            reason.relevant_history,
+            "\n\n"
+        ]
 
-        if input_data.referral_reason.previous_treatments:
-            summary += f"Previous treatments include: {', '.join(input_data.referral_reason.previous_treatments)}. "
+        if reason.previous_treatments:
+            parts.append(f"Previous treatments include: {', '.join(reason.previous_treatments)}. ")
 
-        summary += f"\nClinical Question: {input_data.referral_reason.clinical_question}\n"
+        parts.append(f"\nClinical Question: {reason.clinical_question}\n")
 
-        if input_data.current_medications:
-            summary += f"\nCurrent medications: {', '.join(input_data.current_medications[:5])}"
-            if len(input_data.current_medications) > 5:
-                summary += f" (and {len(input_data.current_medications) - 5} more - see attached list)"
+        medications = input_data.current_medications
+        if medications:
+            parts.append("\nCurrent medications: ")
+            parts.append(", ".join(islice(medications, 5)))
+            if len(medications) > 5:
+                parts.append(f" (and {len(medications) - 5} more - see attached list)")
 
-        return summary.strip()
+        return "".join(parts).strip()
 
     def _determine_next_steps(
         self,
@@ -688,24 +1254,17 @@ Patient {input_data.patient_name} is being referred to {input_data.specialty_nee
     ) -> list[str]:
         """Determine next steps for referral"""
 
-        steps = []
-
         if not specialists:
-            steps.append("⚠️ No matching specialists found - may need to expand search criteria")
-            return steps
+            return ["⚠️ No matching specialists found - may need to expand search criteria"]
 
+        steps = list(URGENCY_STEP_PREFIX.get(input_data.urgency, ()))
         steps.append(f"Review {len(specialists)} recommended specialists and select preferred provider")
 
         if auth_req.requires_prior_auth:
             steps.append(f"Submit prior authorization request with required documentation")
             steps.append(f"Estimated authorization approval time: {auth_req.estimated_approval_time_days} days")
 
-        steps.append("Send referral documentation to selected specialist")
-        steps.append("Coordinate appointment scheduling with patient")
-        steps.append("Monitor referral completion and specialist report")
-
-        if input_data.urgency in [ReferralUrgency.EMERGENT, ReferralUrgency.URGENT]:
-            steps.insert(0, f"⚠️ {input_data.urgency.value.upper()} referral - expedite all steps")
+        steps.extend(REFERRAL_COORDINATION_STEPS)
 
         return steps
 
@@ -716,22 +1275,9 @@ Patient {input_data.patient_name} is being referred to {input_data.specialty_nee
     ) -> str:
         """Calculate expected timeline for referral completion"""
 
-        auth_days = auth_req.estimated_approval_time_days if auth_req.requires_prior_auth else 0
-
-        urgency_targets = {
-            ReferralUrgency.EMERGENT: 1,
-            ReferralUrgency.URGENT: 7,
-            ReferralUrgency.ROUTINE: 30,
-            ReferralUrgency.NON_URGENT: 90
-        }
-
-        target_days = urgency_targets[urgency]
-        total_days = auth_days + target_days
-
-        if auth_req.requires_prior_auth:
-            return f"Estimated {total_days} days total ({auth_days} days for authorization + {target_days} days to appointment)"
-        else:
-            return f"Estimated {target_days} days to appointment"
+        return _calculate_timeline_cached(
+            urgency, auth_req.requires_prior_auth, auth_req.estimated_approval_time_days
+        )
 
     def _check_missing_information(
         self,
@@ -798,15 +1344,16 @@ Patient {input_data.patient_name} is being referred to {input_data.specialty_nee
 
         # Simulate referral created 10 days ago
         days_since = 10
+        now = datetime.now()
 
         tracking = ReferralTracking(
             referral_id=input_data.referral_id,
             status=ReferralStatus.APPOINTMENT_SCHEDULED,
-            status_updated_at=(datetime.now() - timedelta(days=2)).isoformat(),
+            status_updated_at=(now - timedelta(days=2)).isoformat(),
             authorization_id="AUTH12345",
-            authorization_valid_until=(datetime.now() + timedelta(days=80)).isoformat(),
+            authorization_valid_until=(now + timedelta(days=80)).isoformat(),
             specialist_name="Dr. Sarah Johnson",
-            appointment_date=(datetime.now() + timedelta(days=5)).isoformat(),
+            appointment_date=(now + timedelta(days=5)).isoformat(),
             appointment_completed=False,
             report_received=False,
             report_date=None,
@@ -851,25 +1398,29 @@ Patient {input_data.patient_name} is being referred to {input_data.specialty_nee
         if not input_data.referral_id:
             raise ValueError("referral_id required for complete action")
 
-        # In production, this would update the referral in database
-        # and trigger care plan updates
+        now = datetime.now()
+        now_iso = now.isoformat()
 
         tracking = ReferralTracking(
             referral_id=input_data.referral_id,
             status=ReferralStatus.COMPLETED,
-            status_updated_at=datetime.now().isoformat(),
+            status_updated_at=now_iso,
             authorization_id="AUTH12345",
-            authorization_valid_until=(datetime.now() + timedelta(days=70)).isoformat(),
+            authorization_valid_until=(now + timedelta(days=70)).isoformat(),
             specialist_name="Dr. Sarah Johnson",
-            appointment_date=(datetime.now() - timedelta(days=2)).isoformat(),
+            appointment_date=(now - timedelta(days=2)).isoformat(),
             appointment_completed=True,
             report_received=True,
-            report_date=datetime.now().isoformat(),
+            report_date=now_iso,
             days_since_referral=15,
             action_needed=None,
             action_due_date=None
         )
 
+        # Persist and notify off the critical path
+        run_in_background(self._persist_tracking(tracking))
+        run_in_background(self._trigger_care_plan_update(input_data, tracking))
+
         next_steps = [
             "Referral completed successfully",
             "Review specialist report and recommendations",
@@ -896,3 +1447,19 @@ Patient {input_data.patient_name} is being referred to {input_data.specialty_nee
             confidence=1.0,
             needs_human_review=False
         )
+
+    async def _persist_tracking(self, tracking: ReferralTracking) -> None:
+        """Persist referral tracking record"""
+
+        # In production, this would update the referral in database
+        pass
+
+    async def _trigger_care_plan_update(
+        self,
+        input_data: ReferralManagementInput,
+        tracking: ReferralTracking
+    ) -> None:
+        """Notify care plan management of specialist input"""
+
+        # In production, this would trigger care plan updates
+        pass
@@ -9,11 +9,17 @@ Intelligently matches patients with available clinicians based on:
 - Historical match quality
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import heapq
+import sys
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, Field, field_validator
 from structlog import get_logger
 
 from platform_core.agent_orchestration.base_agent import BaseAgent
@@ -21,6 +27,114 @@ from platform_core.agent_orchestration.base_agent import BaseAgent
 logger = get_logger()
 
 
+@lru_cache(maxsize=8192)
+def _parse_ymd(value: str) -> datetime:
+    """Parse a YYYY-MM-DD date (much faster than strptime for this fixed format)."""
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"time data {value!r} does not match format '%Y-%m-%d'")
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+@lru_cache(maxsize=8192)
+def _ymd_ordinal(value: str) -> int:
+    """Proleptic Gregorian ordinal of a YYYY-MM-DD date."""
+    return _parse_ymd(value).toordinal()
+
+
+def _days_until(value: str, today_ordinal: int) -> int:
+    """Calendar days from today (given as an ordinal) until a YYYY-MM-DD date (0 = today)."""
+    return _ymd_ordinal(value) - today_ordinal
+
+
+# Availability points by days until next availability: each threshold is the
+# inclusive upper bound of a bucket (past dates, today, 3 days, 1 week, 2 weeks, later)
+AVAILABILITY_DAY_THRESHOLDS = np.array([-1, 0, 3, 7, 14])
+AVAILABILITY_POINTS = np.array([12.0, 15.0, 12.0, 10.0, 7.0, 3.0])
+
+
+# Lowercase weekday names indexed by datetime.weekday()
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Time-of-day buckets indexed by _time_of_day_bucket(); boundaries at 12:00 and 17:00
+TIME_SLOT_NAMES = ("morning", "afternoon", "evening")
+TIME_SLOT_HOUR_BOUNDARIES = np.array([12, 17])
+
+# Structured layout of a clinician's available slots for vectorized slot selection
+SLOT_TABLE_DTYPE = np.dtype(
+    [
+        ("start", "datetime64[m]"),  # wall-clock start time, as written in the slot
+        ("start_rank", np.int64),  # position when ordered by start_time string
+        ("modality", "U16"),  # lowercase
+    ]
+)
+
+
+@lru_cache(maxsize=8192)
+def _lower_interned(value: str) -> str:
+    """Lowercase and intern a matching key (specialties and genders repeat across clinicians)."""
+    return sys.intern(value.lower())
+
+
+@lru_cache(maxsize=8192)
+def _parse_slot_start(value: str) -> datetime:
+    """Parse an ISO 8601 slot start time, accepting a trailing "Z" for UTC."""
+    if value.endswith("Z"):
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=UTC)
+    return datetime.fromisoformat(value)
+
+
+# Experience points by total patients seen: each threshold is the inclusive lower
+# bound of a bucket (fewer than 20, 20+, 100+, 500+)
+EXPERIENCE_SEEN_THRESHOLDS = np.array([20, 100, 500])
+EXPERIENCE_POINTS = np.array([0.0, 4.0, 7.0, 10.0])
+
+
+def _score_kernel(
+    subspec_ok: np.ndarray,
+    insurance_ok: np.ndarray,
+    availability_points: np.ndarray,
+    gender_ok: np.ndarray,
+    lang_ok: np.ndarray,
+    distance_ok: np.ndarray,
+    modality_ok: np.ndarray,
+    rating: np.ndarray,
+    total_seen: np.ndarray,
+    prev_clin_ok: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute match scores for all clinicians with whole-array operations.
+
+    Numeric counterpart of SmartSchedulingAgent._score_clinician_match; factors
+    are added in the same order (a factor that does not apply adds exactly 0.0)
+    so both produce identical scores.
+    """
+    # Factor 1: Specialty match
+    score = 15.0 + 5.0 * subspec_ok
+
+    # Factor 2: Insurance
+    score += 20.0 * insurance_ok
+
+    # Factor 3: Availability
+    score += availability_points
+
+    # Factor 4: Patient preferences
+    score += 5.0 * gender_ok
+    score += 5.0 * lang_ok
+    score += 5.0 * distance_ok
+    score += 5.0 * modality_ok
+
+    # Factor 5: Clinician quality (0 when unrated)
+    score += (rating / 5.0) * 15
+
+    # Factor 6: Experience
+    score += EXPERIENCE_POINTS[np.searchsorted(EXPERIENCE_SEEN_THRESHOLDS, total_seen, side="right")]
+
+    # Factor 7: Continuity of care
+    score += 10.0 * prev_clin_ok
+
+    return np.minimum(score / 100, 1.0)
+
+
 # Input/Output Models
 
 
@@ -48,9 +162,11 @@ class ClinicianAvailability(BaseModel):
     specialty: str
     sub_specialty: Optional[str] = None
     gender: str
-    languages: list[str] = Field(default_factory=list)
-    license_states: list[str] = Field(default_factory=list)
-    accepted_insurance_payers: list[str] = Field(default_factory=list)
+    languages: frozenset[str] = Field(default_factory=frozenset, description="Language codes (lowercase)")
+    license_states: frozenset[str] = Field(default_factory=frozenset, description="State codes (uppercase)")
+    accepted_insurance_payers: frozenset[str] = Field(
+        default_factory=frozenset, description="Insurance payer IDs (uppercase)"
+    )
     location_city: Optional[str] = None
     location_state: Optional[str] = None
     distance_from_patient_miles: Optional[float] = None
@@ -63,6 +179,52 @@ class ClinicianAvailability(BaseModel):
     total_patients_seen: Optional[int] = Field(None, description="Total patients seen (experience indicator)")
     next_available_date: Optional[str] = Field(None, description="Next available appointment date (YYYY-MM-DD)")
 
+    # Lowercased keys for case-insensitive matching. Derived from the fields on
+    # each access (memoized per string), so they follow assignment and model_copy.
+
+    @property
+    def _specialty_lc(self) -> str:
+        """Lowercase specialty."""
+        return _lower_interned(self.specialty)
+
+    @property
+    def _sub_specialty_lc(self) -> Optional[str]:
+        """Lowercase sub-specialty (None if not set)."""
+        return _lower_interned(self.sub_specialty) if self.sub_specialty is not None else None
+
+    @property
+    def _gender_lc(self) -> str:
+        """Lowercase gender."""
+        return _lower_interned(self.gender)
+
+    def slot_table(self) -> np.ndarray:
+        """
+        Get available_slots as a structured array (see SLOT_TABLE_DTYPE).
+
+        Built on each call, as available_slots is a mutable list of dicts; start
+        times are parsed through a shared memo, so rebuilding stays cheap.
+        """
+        slots = self.available_slots
+        start_times = [slot["start_time"] for slot in slots]
+
+        table = np.empty(len(slots), dtype=SLOT_TABLE_DTYPE)
+        table["start"] = [_parse_slot_start(value).replace(tzinfo=None) for value in start_times]
+        table["start_rank"][np.argsort(np.array(start_times), kind="stable")] = np.arange(len(slots))
+        table["modality"] = [(slot.get("modality") or "").lower() for slot in slots]
+        return table
+
+    @field_validator("languages", mode="after")
+    @classmethod
+    def normalize_languages(cls, v: frozenset[str]) -> frozenset[str]:
+        """Lowercase language codes for O(1) case-insensitive lookup."""
+        return frozenset(sys.intern(code.lower()) for code in v)
+
+    @field_validator("license_states", "accepted_insurance_payers", mode="after")
+    @classmethod
+    def normalize_codes(cls, v: frozenset[str]) -> frozenset[str]:
+        """Uppercase state and payer codes for O(1) case-insensitive lookup."""
+        return frozenset(sys.intern(code.upper()) for code in v)
+
 
 class SmartSchedulingInput(BaseModel):
     """Input for smart scheduling agent."""
@@ -83,6 +245,22 @@ class SmartSchedulingInput(BaseModel):
     available_clinicians: list[ClinicianAvailability] = Field(..., description="List of available clinicians to match")
     max_matches: int = Field(default=5, description="Maximum number of matches to return")
 
+    @field_validator("specialty_required", "patient_location_state", "patient_insurance_payer_id")
+    @classmethod
+    def intern_codes(cls, v: Optional[str]) -> Optional[str]:
+        """Intern request codes that are compared against interned clinician codes."""
+        return sys.intern(v) if v is not None else None
+
+    def clinicians_with_specialty(self, specialty: str) -> list[ClinicianAvailability]:
+        """
+        Get available clinicians whose specialty matches (case-insensitive), in input order.
+
+        Filtered on each call rather than indexed once, so changes to
+        available_clinicians after validation are always seen.
+        """
+        specialty_lc = specialty.lower()
+        return [clinician for clinician in self.available_clinicians if clinician._specialty_lc == specialty_lc]
+
 
 class ClinicianMatch(BaseModel):
     """A matched clinician with scoring details."""
@@ -113,6 +291,51 @@ class SmartSchedulingOutput(BaseModel):
     no_match_reason: Optional[str] = Field(None, description="Reason if no suitable matches found")
 
 
+def _name_mask(names: tuple[str, ...], selected: list[str]) -> np.ndarray:
+    """Boolean mask over names marking those selected (case-insensitive)."""
+    selected_lc = {name.lower() for name in selected}
+    return np.array([name in selected_lc for name in names], dtype=np.bool_)
+
+
+@dataclass(slots=True, frozen=True)
+class _NormalizedPreferences:
+    """Patient preferences normalized once per request for the per-clinician scoring loops."""
+
+    sub_specialty_lc: Optional[str]
+    gender: Optional[str]  # lowercase; None when there is no gender preference
+    language: Optional[str]  # as given, for match reasons
+    language_lc: Optional[str]
+    max_distance_miles: Optional[float]
+    modality: Optional[str]  # as given; clinician modality checks are exact
+    modality_lc: Optional[str]  # for case-insensitive slot modality checks
+    preferred_weekdays: np.ndarray  # bool mask indexed by weekday (Monday = 0)
+    preferred_time_slots: np.ndarray  # bool mask indexed like TIME_SLOT_NAMES
+    previous_clinician_id: Optional[str]
+
+    @classmethod
+    def from_input(cls, input_data: SmartSchedulingInput) -> "_NormalizedPreferences":
+        """Build normalized preferences from the request model."""
+        prefs = input_data.patient_preferences
+        return cls(
+            sub_specialty_lc=(
+                sys.intern(input_data.sub_specialty_preferred.lower()) if input_data.sub_specialty_preferred else None
+            ),
+            gender=(
+                sys.intern(prefs.preferred_gender.lower())
+                if prefs.preferred_gender and prefs.preferred_gender != "no_preference"
+                else None
+            ),
+            language=prefs.preferred_language or None,
+            language_lc=sys.intern(prefs.preferred_language.lower()) if prefs.preferred_language else None,
+            max_distance_miles=prefs.max_distance_miles,
+            modality=prefs.preferred_modality,
+            modality_lc=prefs.preferred_modality.lower() if prefs.preferred_modality else None,
+            preferred_weekdays=_name_mask(WEEKDAY_NAMES, prefs.preferred_days),
+            preferred_time_slots=_name_mask(TIME_SLOT_NAMES, prefs.preferred_time_slots),
+            previous_clinician_id=prefs.previous_clinician_id or None,
+        )
+
+
 # Agent Implementation
 
 
@@ -136,15 +359,29 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         input_data: SmartSchedulingInput,
         context: dict[str, Any],
     ) -> tuple[SmartSchedulingOutput, float, dict[str, Any]]:
-        """Execute smart scheduling logic."""
+        """
+        Execute smart scheduling logic.
+
+        Matching is CPU-bound, so it runs in a worker thread to keep the event
+        loop responsive; NumPy releases the GIL during the kernel's large array
+        operations.
+        """
+        return await asyncio.to_thread(self._match_clinicians, input_data)
+
+    def _match_clinicians(
+        self, input_data: SmartSchedulingInput
+    ) -> tuple[SmartSchedulingOutput, float, dict[str, Any]]:
+        """Filter, score and rank clinicians for a scheduling request."""
+        # All date comparisons are relative to the request start
         start_time = datetime.now()
+        today = start_time.date()
 
         # Step 1: Filter clinicians by hard requirements
-        eligible_clinicians = self._filter_eligible_clinicians(input_data)
+        eligible_clinicians = self._filter_eligible_clinicians(input_data, today)
 
         if not eligible_clinicians:
             # No eligible clinicians found
-            output = SmartSchedulingOutput(
+            output = SmartSchedulingOutput.model_construct(
                 matched_clinicians=[],
                 total_clinicians_evaluated=len(input_data.available_clinicians),
                 top_match_score=0.0,
@@ -153,40 +390,47 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
             )
             return output, 0.0, {"no_matches": True}
 
-        # Step 2: Score each eligible clinician
-        scored_matches = []
-        for clinician in eligible_clinicians:
-            match_score, match_reasons, concerns = self._score_clinician_match(input_data, clinician)
+        # Step 2: Score all eligible clinicians with the numeric kernel
+        prefs = _NormalizedPreferences.from_input(input_data)
+        features = self._build_score_features(input_data, eligible_clinicians, prefs, today)
+        scores = _score_kernel(*features)
+
+        # Step 3: Select the top-K by match score (ties keep input order) and
+        # build match details only for the returned clinicians
+        score_list = scores.tolist()
+        top_indices = heapq.nlargest(input_data.max_matches, range(len(score_list)), key=score_list.__getitem__)
+
+        top_matches = []
+        for idx in top_indices:
+            clinician = eligible_clinicians[idx]
+            _, match_reasons, concerns, insurance_accepted = self._score_clinician_match(
+                input_data, clinician, prefs, today
+            )
 
             # Find best appointment slot
-            recommended_appointment = self._find_best_appointment_slot(
-                clinician, input_data.patient_preferences, input_data.urgency_level
-            )
+            recommended_appointment = self._find_best_appointment_slot(clinician, prefs, input_data.urgency_level)
 
-            match = ClinicianMatch(
+            # Values come from validated inputs, so skip re-validation
+            match = ClinicianMatch.model_construct(
                 clinician_id=clinician.clinician_id,
                 full_name=clinician.full_name,
                 specialty=clinician.specialty,
                 sub_specialty=clinician.sub_specialty,
-                match_score=match_score,
+                match_score=score_list[idx],
                 match_reasons=match_reasons,
                 potential_concerns=concerns,
                 recommended_appointment=recommended_appointment,
                 distance_miles=clinician.distance_from_patient_miles,
-                insurance_accepted=self._check_insurance_accepted(input_data, clinician),
+                insurance_accepted=insurance_accepted,
                 next_available_date=clinician.next_available_date or "Unknown",
                 rating=clinician.rating,
             )
-            scored_matches.append(match)
-
-        # Step 3: Sort by match score and limit results
-        scored_matches.sort(key=lambda x: x.match_score, reverse=True)
-        top_matches = scored_matches[: input_data.max_matches]
+            top_matches.append(match)
 
         # Step 4: Generate recommendation
         recommendation = self._generate_recommendation(top_matches, input_data)
 
-        output = SmartSchedulingOutput(
+        output = SmartSchedulingOutput.model_construct(
             matched_clinicians=top_matches,
             total_clinicians_evaluated=len(input_data.available_clinicians),
             top_match_score=top_matches[0].match_score if top_matches else 0.0,
@@ -194,7 +438,7 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         )
 
         # Calculate confidence
-        confidence = self._calculate_scheduling_confidence(input_data, top_matches)
+        confidence = self._calculate_scheduling_confidence(input_data, top_matches, today)
 
         execution_time_ms = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -210,49 +454,155 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
 
         return output, confidence, metadata
 
-    def _filter_eligible_clinicians(self, input_data: SmartSchedulingInput) -> list[ClinicianAvailability]:
-        """Filter clinicians by hard requirements (specialty, license, availability)."""
-        eligible = []
-
-        for clinician in input_data.available_clinicians:
-            # Check specialty match
-            if clinician.specialty.lower() != input_data.specialty_required.lower():
-                continue
-
-            # Check license state (for telehealth)
-            if input_data.patient_location_state not in clinician.license_states:
-                continue
+    def _filter_eligible_clinicians(
+        self, input_data: SmartSchedulingInput, today: Optional[date] = None
+    ) -> list[ClinicianAvailability]:
+        """
+        Filter clinicians by hard requirements (specialty, license, availability).
 
-            # Check has available slots
-            if not clinician.available_slots:
-                continue
+        Starts from the clinicians of the required specialty; each remaining
+        requirement is evaluated as a boolean column and combined into a single mask.
+        """
+        clinicians = input_data.clinicians_with_specialty(input_data.specialty_required)
+        count = len(clinicians)
+        if not count:
+            return []
+
+        # Check license state (for telehealth)
+        state = input_data.patient_location_state.upper()
+        mask = np.fromiter((state in c.license_states for c in clinicians), dtype=np.bool_, count=count)
+
+        # Check has available slots
+        mask &= np.fromiter((bool(c.available_slots) for c in clinicians), dtype=np.bool_, count=count)
+
+        # Check urgency requirements (clinicians without a next available date pass)
+        if input_data.urgency_level in ("urgent", "emergency"):
+            next_dates = np.array(
+                [c.next_available_date or "NaT" for c in clinicians], dtype="datetime64[D]"
+            )
+            today64 = np.datetime64(today or date.today(), "D")
 
-            # Check urgency requirements
             if input_data.urgency_level == "urgent":
                 # For urgent, need appointment within 3 days
-                if clinician.next_available_date:
-                    next_date = datetime.strptime(clinician.next_available_date, "%Y-%m-%d")
-                    if (next_date - datetime.now()).days > 3:
-                        continue
-            elif input_data.urgency_level == "emergency":
+                timely = next_dates - today64 <= np.timedelta64(3, "D")
+            else:
                 # For emergency, need same-day appointment
-                if clinician.next_available_date:
-                    next_date = datetime.strptime(clinician.next_available_date, "%Y-%m-%d")
-                    if next_date.date() != datetime.now().date():
-                        continue
+                timely = next_dates == today64
+
+            mask &= np.isnat(next_dates) | timely
+
+        return [clinicians[i] for i in np.flatnonzero(mask)]
+
+    def _build_score_features(
+        self,
+        input_data: SmartSchedulingInput,
+        clinicians: list[ClinicianAvailability],
+        prefs: _NormalizedPreferences,
+        today: date,
+    ) -> tuple[np.ndarray, ...]:
+        """
+        Extract the per-clinician inputs of _score_kernel as column arrays.
+
+        Mirrors the conditions in _score_clinician_match; columns are returned in
+        kernel argument order. Preferences the patient did not set are constant
+        for the whole request, so their columns are filled without visiting
+        clinicians.
+        """
+        count = len(clinicians)
+        no_match = np.zeros(count, dtype=np.bool_)
+
+        def column(values: Any, dtype: Any = np.bool_) -> np.ndarray:
+            return np.fromiter(values, dtype=dtype, count=count)
+
+        # Factor 1: Sub-specialty
+        sub_specialty = prefs.sub_specialty_lc
+        if sub_specialty:
+            subspec_ok = column(
+                c._sub_specialty_lc == sub_specialty for c in clinicians
+            )
+        else:
+            subspec_ok = no_match
 
-            eligible.append(clinician)
+        # Factor 2: Insurance
+        if input_data.patient_insurance_payer_id:
+            payer_id = input_data.patient_insurance_payer_id.upper()
+            insurance_ok = column(payer_id in c.accepted_insurance_payers for c in clinicians)
+        else:
+            insurance_ok = np.ones(count, dtype=np.bool_)
+
+        # Factor 3: Availability, bucketed into points in one pass
+        today_ordinal = today.toordinal()
+        has_next_date = column(bool(c.next_available_date) for c in clinicians)
+        days_until = column(
+            (_days_until(c.next_available_date, today_ordinal) if c.next_available_date else 0 for c in clinicians),
+            dtype=np.int64,
+        )
+        bucket = np.searchsorted(AVAILABILITY_DAY_THRESHOLDS, days_until)
+        availability_points = np.where(has_next_date, AVAILABILITY_POINTS[bucket], 0.0)
 
-        return eligible
+        # Factor 4: Patient preferences
+        gender = prefs.gender
+        gender_ok = column(c._gender_lc == gender for c in clinicians) if gender else no_match
+
+        language = prefs.language_lc
+        lang_ok = column(language in c.languages for c in clinicians) if language else no_match
+
+        max_distance = prefs.max_distance_miles
+        if max_distance:
+            distance_ok = column(
+                bool(c.distance_from_patient_miles) and c.distance_from_patient_miles <= max_distance
+                for c in clinicians
+            )
+        else:
+            distance_ok = no_match
+
+        if prefs.modality == "telehealth":
+            modality_ok = column(c.offers_telehealth for c in clinicians)
+        elif prefs.modality == "in_person":
+            modality_ok = column(c.offers_in_person for c in clinicians)
+        elif prefs.modality == "hybrid":
+            modality_ok = column(c.offers_telehealth and c.offers_in_person for c in clinicians)
+        else:
+            modality_ok = no_match
+
+        # Factors 5-6: Quality and experience
+        rating = column((c.rating or 0.0 for c in clinicians), dtype=np.float64)
+        total_seen = column((c.total_patients_seen or 0 for c in clinicians), dtype=np.int64)
+
+        # Factor 7: Continuity of care
+        previous_clinician_id = prefs.previous_clinician_id
+        if previous_clinician_id:
+            prev_clin_ok = column(c.clinician_id == previous_clinician_id for c in clinicians)
+        else:
+            prev_clin_ok = no_match
+
+        return (
+            subspec_ok,
+            insurance_ok,
+            availability_points,
+            gender_ok,
+            lang_ok,
+            distance_ok,
+            modality_ok,
+            rating,
+            total_seen,
+            prev_clin_ok,
+        )
 
     def _score_clinician_match(
-        self, input_data: SmartSchedulingInput, clinician: ClinicianAvailability
-    ) -> tuple[float, list[str], list[str]]:
+        self,
+        input_data: SmartSchedulingInput,
+        clinician: ClinicianAvailability,
+        prefs: Optional[_NormalizedPreferences] = None,
+        today: Optional[date] = None,
+    ) -> tuple[float, list[str], list[str], bool]:
         """
         Score a clinician match using multiple factors.
 
-        Returns: (match_score, match_reasons, potential_concerns)
+        Returns: (match_score, match_reasons, potential_concerns, insurance_accepted)
         """
+        prefs = prefs or _NormalizedPreferences.from_input(input_data)
+        today = today or date.today()
         score = 0.0
         reasons = []
         concerns = []
@@ -261,8 +611,8 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         score += 15  # Base for matching specialty
         reasons.append(f"Specializes in {clinician.specialty}")
 
-        if input_data.sub_specialty_preferred and clinician.sub_specialty:
-            if clinician.sub_specialty.lower() == input_data.sub_specialty_preferred.lower():
+        if prefs.sub_specialty_lc and clinician.sub_specialty:
+            if clinician._sub_specialty_lc == prefs.sub_specialty_lc:
                 score += 5
                 reasons.append(f"Sub-specialty match: {clinician.sub_specialty}")
 
@@ -276,9 +626,7 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
 
         # Factor 3: Availability (15 points max)
         if clinician.next_available_date:
-            days_until_available = (
-                datetime.strptime(clinician.next_available_date, "%Y-%m-%d") - datetime.now()
-            ).days
+            days_until_available = _days_until(clinician.next_available_date, today.toordinal())
             if days_until_available == 0:
                 score += 15
                 reasons.append("Available today")
@@ -296,21 +644,20 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
                 concerns.append(f"Next availability: {clinician.next_available_date}")
 
         # Factor 4: Patient preferences (20 points max)
-        prefs = input_data.patient_preferences
 
         # Gender preference
-        if prefs.preferred_gender and prefs.preferred_gender != "no_preference":
-            if clinician.gender.lower() == prefs.preferred_gender.lower():
+        if prefs.gender:
+            if clinician._gender_lc == prefs.gender:
                 score += 5
                 reasons.append(f"Matches gender preference: {clinician.gender}")
 
         # Language preference
-        if prefs.preferred_language:
-            if prefs.preferred_language in clinician.languages:
+        if prefs.language:
+            if prefs.language_lc in clinician.languages:
                 score += 5
-                reasons.append(f"Speaks {prefs.preferred_language}")
+                reasons.append(f"Speaks {prefs.language}")
             else:
-                concerns.append(f"May not speak {prefs.preferred_language}")
+                concerns.append(f"May not speak {prefs.language}")
 
         # Location/distance preference
         if prefs.max_distance_miles and clinician.distance_from_patient_miles:
@@ -321,14 +668,14 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
                 concerns.append(f"Distance: {clinician.distance_from_patient_miles:.1f} miles")
 
         # Modality preference
-        if prefs.preferred_modality:
-            if prefs.preferred_modality == "telehealth" and clinician.offers_telehealth:
+        if prefs.modality:
+            if prefs.modality == "telehealth" and clinician.offers_telehealth:
                 score += 5
                 reasons.append("Offers telehealth")
-            elif prefs.preferred_modality == "in_person" and clinician.offers_in_person:
+            elif prefs.modality == "in_person" and clinician.offers_in_person:
                 score += 5
                 reasons.append("Offers in-person visits")
-            elif prefs.preferred_modality == "hybrid" and clinician.offers_telehealth and clinician.offers_in_person:
+            elif prefs.modality == "hybrid" and clinician.offers_telehealth and clinician.offers_in_person:
                 score += 5
                 reasons.append("Offers both telehealth and in-person")
 
@@ -364,68 +711,47 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         max_possible_score = 100
         normalized_score = min(score / max_possible_score, 1.0)
 
-        return normalized_score, reasons, concerns
+        return normalized_score, reasons, concerns, insurance_accepted
 
     def _check_insurance_accepted(self, input_data: SmartSchedulingInput, clinician: ClinicianAvailability) -> bool:
         """Check if clinician accepts patient's insurance."""
         if not input_data.patient_insurance_payer_id:
             return True  # No insurance specified, assume accepted
 
-        return input_data.patient_insurance_payer_id in clinician.accepted_insurance_payers
+        return input_data.patient_insurance_payer_id.upper() in clinician.accepted_insurance_payers
 
     def _find_best_appointment_slot(
         self,
         clinician: ClinicianAvailability,
-        preferences: PatientPreferences,
+        preferences: _NormalizedPreferences,
         urgency_level: str,
     ) -> Optional[dict[str, Any]]:
         """Find the best appointment slot based on preferences and urgency."""
         if not clinician.available_slots:
             return None
 
-        # Sort slots by date/time
-        sorted_slots = sorted(clinician.available_slots, key=lambda s: s.get("start_time", ""))
-
         # For emergency/urgent, return first available
         if urgency_level in ["emergency", "urgent"]:
-            return sorted_slots[0] if sorted_slots else None
-
-        # Try to match preferences
-        preferred_slots = []
+            return min(clinician.available_slots, key=lambda s: s.get("start_time", ""))
 
-        for slot in sorted_slots:
-            slot_datetime = datetime.fromisoformat(slot["start_time"].replace("Z", "+00:00"))
-            day_of_week = slot_datetime.strftime("%A").lower()
-            hour = slot_datetime.hour
+        # Score every slot against the preferences at once
+        slots = clinician.slot_table()
+        starts = slots["start"]
+        hours = (starts - starts.astype("datetime64[D]")) // np.timedelta64(1, "h")
+        weekdays = (starts.astype("datetime64[D]").astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        time_slots = np.searchsorted(TIME_SLOT_HOUR_BOUNDARIES, hours, side="right")
 
-            # Determine time of day
-            if hour < 12:
-                time_slot = "morning"
-            elif hour < 17:
-                time_slot = "afternoon"
-            else:
-                time_slot = "evening"
+        slot_scores = preferences.preferred_weekdays[weekdays] * 2 + preferences.preferred_time_slots[time_slots] * 2
 
-            # Score this slot based on preferences
-            slot_score = 0
-
-            if day_of_week in [d.lower() for d in preferences.preferred_days]:
-                slot_score += 2
-
-            if time_slot in [t.lower() for t in preferences.preferred_time_slots]:
-                slot_score += 2
-
-            # Modality preference
-            if preferences.preferred_modality:
-                if slot.get("modality", "").lower() == preferences.preferred_modality.lower():
-                    slot_score += 1
-
-            preferred_slots.append((slot, slot_score))
+        # Modality preference
+        if preferences.modality_lc:
+            slot_scores += slots["modality"] == preferences.modality_lc
 
-        # Sort by preference score, then by date
-        preferred_slots.sort(key=lambda x: (-x[1], x[0].get("start_time", "")))
+        # Highest preference score, then earliest start time
+        best = np.flatnonzero(slot_scores == slot_scores.max())
+        best_index = best[np.argmin(slots["start_rank"][best])]
 
-        return preferred_slots[0][0] if preferred_slots else sorted_slots[0]
+        return clinician.available_slots[best_index]
 
     def _generate_recommendation(self, matches: list[ClinicianMatch], input_data: SmartSchedulingInput) -> str:
         """Generate human-readable scheduling recommendation."""
@@ -441,39 +767,35 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         else:
             quality = "moderate"
 
-        recommendation = (
-            f"Found {len(matches)} {quality} match{'es' if len(matches) > 1 else ''} for "
-            f"{input_data.specialty_required}. "
-        )
+        plural = "es" if len(matches) > 1 else ""
 
         if top_match.match_score >= 0.7:
-            recommendation += (
+            detail = (
                 f"Top recommendation: {top_match.full_name} "
                 f"(match score: {top_match.match_score:.0%}, "
                 f"next available: {top_match.next_available_date})."
             )
         else:
-            recommendation += (
+            detail = (
                 f"Best available: {top_match.full_name}, but consider reviewing concerns. "
                 f"Next available: {top_match.next_available_date}."
             )
 
-        return recommendation
+        return f"Found {len(matches)} {quality} match{plural} for {input_data.specialty_required}. {detail}"
 
     def _determine_no_match_reason(self, input_data: SmartSchedulingInput) -> str:
         """Determine why no matches were found."""
         reasons = []
 
         # Check if any clinicians match specialty
-        specialty_matches = [
-            c for c in input_data.available_clinicians if c.specialty.lower() == input_data.specialty_required.lower()
-        ]
+        specialty_matches = input_data.clinicians_with_specialty(input_data.specialty_required)
 
         if not specialty_matches:
             reasons.append(f"No clinicians available for specialty: {input_data.specialty_required}")
 
         # Check license state
-        license_matches = [c for c in specialty_matches if input_data.patient_location_state in c.license_states]
+        state = input_data.patient_location_state.upper()
+        license_matches = [c for c in specialty_matches if state in c.license_states]
 
         if specialty_matches and not license_matches:
             reasons.append(f"No clinicians licensed in {input_data.patient_location_state}")
@@ -491,7 +813,7 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         return "; ".join(reasons) if reasons else "No eligible clinicians found"
 
     def _calculate_scheduling_confidence(
-        self, input_data: SmartSchedulingInput, matches: list[ClinicianMatch]
+        self, input_data: SmartSchedulingInput, matches: list[ClinicianMatch], today: Optional[date] = None
     ) -> float:
         """Calculate confidence in scheduling recommendations."""
         if not matches:
@@ -525,8 +847,8 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
 
         # Increase if urgent need is met
         if input_data.urgency_level == "urgent" and matches[0].next_available_date:
-            next_date = datetime.strptime(matches[0].next_available_date, "%Y-%m-%d")
-            if (next_date - datetime.now()).days <= 3:
+            today = today or date.today()
+            if _days_until(matches[0].next_available_date, today.toordinal()) <= 3:
                 confidence += 0.1
 
         return max(0.0, min(1.0, confidence))
@@ -536,6 +858,7 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         output: SmartSchedulingOutput,
         confidence: float,
         input_data: SmartSchedulingInput,
+        today: Optional[date] = None,
     ) -> tuple[bool, Optional[str]]:
         """Determine if human review is needed."""
         # Review if no matches found
@@ -554,8 +877,8 @@ class SmartSchedulingAgent(BaseAgent[SmartSchedulingInput, SmartSchedulingOutput
         if input_data.urgency_level in ["urgent", "emergency"]:
             top_match = output.matched_clinicians[0]
             if top_match.next_available_date:
-                next_date = datetime.strptime(top_match.next_available_date, "%Y-%m-%d")
-                days_until = (next_date - datetime.now()).days
+                today = today or date.today()
+                days_until = _days_until(top_match.next_available_date, today.toordinal())
                 if input_data.urgency_level == "emergency" and days_until > 0:
                     return True, "Emergency request but no same-day availability"
                 if input_data.urgency_level == "urgent" and days_until > 3:
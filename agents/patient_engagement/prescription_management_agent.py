@@ -5,14 +5,64 @@ Automates prescription refills, monitors medication adherence, detects
 potential issues, and coordinates with pharmacies and providers.
 """
 
+import asyncio
+import sys
+from collections.abc import Iterable
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain, count
 from typing import Any, Optional, Literal
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 from platform_core.agents.base_agent import BaseAgent
 
 
+# ============================================================================
+# Date Handling
+# ============================================================================
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Refill request ID suffix, so IDs issued in the same second never collide
+_refill_sequence = count(1)
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 date or datetime as naive local time (comparable with datetime.now())"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _epoch_microseconds(value: datetime) -> int:
+    """Microseconds from the epoch to a naive datetime"""
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+@lru_cache(maxsize=4096)
+def _parse_epoch_microseconds(value: str) -> int:
+    """Parse an ISO 8601 date or datetime as epoch microseconds (see _parse_datetime)"""
+    return _epoch_microseconds(_parse_datetime(value))
+
+
+@lru_cache(maxsize=4096)
+def _interned_lower(value: str) -> str:
+    """Lowercase and intern a drug or allergy name (the same names recur across patients)"""
+    return sys.intern(value.lower())
+
+
+@lru_cache(maxsize=4096)
+def _base_name(name: str) -> str:
+    """Interned lowercase first word of a drug name (empty if none)"""
+    words = _interned_lower(name).split(maxsplit=1)
+    return sys.intern(words[0]) if words else ""
+
+
 # ============================================================================
 # Input/Output Models
 # ============================================================================
@@ -65,6 +115,42 @@ class Medication(BaseModel):
     last_filled_date: Optional[str] = None
     next_refill_due: Optional[str] = None
 
+    @field_validator("last_filled_date", "next_refill_due")
+    @classmethod
+    def check_iso_date(cls, value: Optional[str]) -> Optional[str]:
+        """Reject adherence dates that are not ISO 8601"""
+        if value:
+            _parse_datetime(value)
+        return value
+
+    @property
+    def display_name(self) -> str:
+        """Medication name with dosage, as shown in results"""
+        return f"{self.name} {self.dosage}"
+
+    @property
+    def name_lower(self) -> str:
+        """Lowercase name (interned, as the same drug names recur across patients)"""
+        return _interned_lower(self.name)
+
+    @property
+    def base_name(self) -> str:
+        """Lowercase first word of the name (empty if none), used to spot duplicate therapy"""
+        return _base_name(self.name)
+
+    # Adherence dates are derived from the fields on each access (parsing is
+    # memoized per date string), so they follow model_copy(update=...) and assignment
+
+    @property
+    def _last_filled_us(self) -> Optional[int]:
+        """Last fill date as epoch microseconds (None if not set)"""
+        return _parse_epoch_microseconds(self.last_filled_date) if self.last_filled_date else None
+
+    @property
+    def _next_refill_due_us(self) -> Optional[int]:
+        """Next refill due date as epoch microseconds (None if not set)"""
+        return _parse_epoch_microseconds(self.next_refill_due) if self.next_refill_due else None
+
 
 class PatientProfile(BaseModel):
     """Patient profile for prescription management"""
@@ -83,6 +169,24 @@ class PatientProfile(BaseModel):
     # Pharmacy info
     preferred_pharmacy: Optional[dict[str, Any]] = None
 
+    # Derived views are recomputed on every access rather than cached, since the
+    # profile is mutable; each action reads them once
+
+    @property
+    def allergies_lower(self) -> list[tuple[str, str]]:
+        """Allergies paired with their interned lowercase form, for matching against medication names"""
+        return [(allergy, _interned_lower(allergy)) for allergy in self.allergies]
+
+    @property
+    def active_medications(self) -> list[Medication]:
+        """Current medications with active status"""
+        return [med for med in self.current_medications if med.status is MedicationStatus.ACTIVE]
+
+    @property
+    def medications_by_id(self) -> dict[str, Medication]:
+        """Current medications by ID (the first medication with a given ID wins)"""
+        return {med.medication_id: med for med in reversed(self.current_medications)}
+
 
 class RefillRequest(BaseModel):
     """Prescription refill request"""
@@ -113,8 +217,12 @@ class PrescriptionManagementInput(BaseModel):
     adherence_period_days: int = Field(default=90, description="Days to analyze adherence")
 
 
+# Result models are only built by the agent from already validated inputs, so
+# they are created with model_construct (no per-field validation)
 class RefillRecommendation(BaseModel):
     """Refill recommendation"""
+    model_config = ConfigDict(frozen=True)
+
     medication_id: str
     medication_name: str
 
@@ -132,6 +240,8 @@ class RefillRecommendation(BaseModel):
 
 class RefillResult(BaseModel):
     """Result of refill request"""
+    model_config = ConfigDict(frozen=True)
+
     medication_id: str
     medication_name: str
 
@@ -149,6 +259,8 @@ class RefillResult(BaseModel):
 
 class AdherenceAnalysis(BaseModel):
     """Medication adherence analysis"""
+    model_config = ConfigDict(frozen=True)
+
     medication_id: str
     medication_name: str
 
@@ -161,12 +273,15 @@ class AdherenceAnalysis(BaseModel):
 
     refill_pattern: str  # consistent, irregular, declining
 
-    barriers_identified: list[str] = Field(default_factory=list)
-    recommendations: list[str] = Field(default_factory=list)
+    # Tuples, as analyses are memoized and shared between results
+    barriers_identified: tuple[str, ...] = ()
+    recommendations: tuple[str, ...] = ()
 
 
 class MedicationIssue(BaseModel):
     """Detected medication issue"""
+    model_config = ConfigDict(frozen=True)
+
     issue_type: str = Field(
         ...,
         description="drug_interaction, duplicate_therapy, allergy_concern, adherence_problem, contraindication, other"
@@ -184,6 +299,8 @@ class MedicationIssue(BaseModel):
 
 class PrescriptionManagementOutput(BaseModel):
     """Output from prescription management"""
+    model_config = ConfigDict(frozen=True)
+
     success: bool
 
     # Refill recommendations
@@ -211,6 +328,119 @@ class PrescriptionManagementOutput(BaseModel):
     needs_human_review: bool
 
 
+# ============================================================================
+# Refill and Adherence Tables
+# ============================================================================
+
+
+# Refill urgency by days until supply runs out: each threshold is the inclusive
+# upper bound of a bucket (exhausted, 3 days, 1 week, later)
+REFILL_DAY_THRESHOLDS = np.array([0, 3, 7])
+REFILL_URGENCIES = ("urgent", "urgent", "soon", "routine")
+REFILL_RECOMMENDATIONS = (
+    "Medication supply exhausted - immediate refill needed",
+    "Refill needed within {days} days",
+    "Refill recommended within {days} days",
+    "No immediate refill needed ({days} days remaining)"
+)
+
+# Estimated adherence by refill timing: on time, slightly late, very late, no fill data
+ADHERENCE_RATES = np.array([0.95, 0.80, 0.60, 0.75])
+REFILL_PATTERNS = ("consistent", "irregular", "declining", "unknown")
+
+# A refill is slightly late up to this multiple of the days supply
+LATE_REFILL_FACTOR = 1.2
+
+# Adherence level by rate: each threshold is the inclusive lower bound of the next level
+ADHERENCE_LEVEL_THRESHOLDS = np.array([0.60, 0.80, 0.90])
+ADHERENCE_LEVELS = (AdherenceLevel.POOR, AdherenceLevel.FAIR, AdherenceLevel.GOOD, AdherenceLevel.EXCELLENT)
+
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+@lru_cache(maxsize=4096)
+def _refill_recommendation_cached(
+    medication_id: str,
+    medication_name: str,
+    refills_remaining: int,
+    days_until_out: int,
+    bucket: int,
+    needs_refill: bool,
+    can_auto_approve: bool,
+    requires_provider: bool
+) -> RefillRecommendation:
+    """
+    Build a refill recommendation from its evaluated refill factors
+
+    Recommendations are frozen, so repeated checks of an unchanged medication
+    (e.g. check_refills then request_refill) share one instance.
+    """
+
+    return RefillRecommendation.model_construct(
+        medication_id=medication_id,
+        medication_name=medication_name,
+        needs_refill=needs_refill,
+        days_until_out=days_until_out,
+        refills_remaining=refills_remaining,
+        recommendation=REFILL_RECOMMENDATIONS[bucket].format(days=days_until_out),
+        urgency=REFILL_URGENCIES[bucket],
+        can_auto_approve=can_auto_approve,
+        auto_approve_reason=(
+            f"Refills remaining ({refills_remaining}), routine request" if can_auto_approve else None
+        ),
+        requires_provider_approval=requires_provider
+    )
+
+
+@lru_cache(maxsize=4096)
+def _adherence_analysis_cached(
+    medication_id: str,
+    medication_name: str,
+    period_days: int,
+    timing: int,
+    level_index: int,
+    doses_taken: int
+) -> AdherenceAnalysis:
+    """
+    Build an adherence analysis from its refill timing bucket and adherence level
+
+    Analyses are frozen with tuple fields, so the shared instances cannot be
+    mutated through one result.
+    """
+
+    adherence_rate = float(ADHERENCE_RATES[timing])
+    refill_pattern = REFILL_PATTERNS[timing]
+
+    # Identify potential barriers
+    barriers = []
+    if adherence_rate < 0.80:
+        if refill_pattern == "irregular":
+            barriers.append("Inconsistent refill pattern")
+        if refill_pattern == "declining":
+            barriers.append("Declining adherence over time")
+
+    # Recommendations
+    recommendations = []
+    if adherence_rate < 0.80:
+        recommendations.append("Set up medication reminders")
+        recommendations.append("Discuss barriers with patient")
+        if refill_pattern == "irregular":
+            recommendations.append("Offer auto-refill program")
+
+    return AdherenceAnalysis.model_construct(
+        medication_id=medication_id,
+        medication_name=medication_name,
+        adherence_rate=adherence_rate,
+        adherence_level=ADHERENCE_LEVELS[level_index],
+        doses_prescribed=period_days,
+        doses_taken_estimated=doses_taken,
+        doses_missed_estimated=period_days - doses_taken,
+        refill_pattern=refill_pattern,
+        barriers_identified=tuple(barriers),
+        recommendations=tuple(recommendations)
+    )
+
+
 # ============================================================================
 # Agent Implementation
 # ============================================================================
@@ -238,6 +468,14 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
     def __init__(self):
         super().__init__()
 
+        # Workflow for each action
+        self._action_handlers = {
+            "check_refills": self._check_refills,
+            "request_refill": self._request_refills,
+            "check_adherence": self._check_adherence,
+            "detect_issues": self._detect_issues
+        }
+
     async def _execute_internal(
         self,
         input_data: PrescriptionManagementInput,
@@ -245,17 +483,12 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
     ) -> PrescriptionManagementOutput:
         """Execute prescription management workflow"""
 
-        if input_data.action == "check_refills":
-            return await self._check_refills(input_data, context)
-        elif input_data.action == "request_refill":
-            return await self._request_refills(input_data, context)
-        elif input_data.action == "check_adherence":
-            return await self._check_adherence(input_data, context)
-        elif input_data.action == "detect_issues":
-            return await self._detect_issues(input_data, context)
-        else:
+        handler = self._action_handlers.get(input_data.action)
+        if handler is None:
             raise ValueError(f"Unknown action: {input_data.action}")
 
+        return await handler(input_data, context)
+
     async def _check_refills(
         self,
         input_data: PrescriptionManagementInput,
@@ -266,16 +499,11 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         patient = input_data.patient_profile
 
         # Analyze each active medication
-        refill_recommendations = []
-        for med in patient.current_medications:
-            if med.status != MedicationStatus.ACTIVE:
-                continue
-
-            recommendation = self._analyze_refill_need(med)
-            refill_recommendations.append(recommendation)
+        active_meds = patient.active_medications
+        refill_recommendations = self._analyze_refill_needs(active_meds, datetime.now())
 
         # Check for any issues
-        issues = self._check_for_issues(patient.current_medications, patient.allergies)
+        issues = self._check_for_issues(active_meds, patient.allergies_lower)
 
         # Generate summary
         needs_refill = [r for r in refill_recommendations if r.needs_refill]
@@ -304,67 +532,64 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
             needs_human_review=requires_review
         )
 
-    def _analyze_refill_need(self, medication: Medication) -> RefillRecommendation:
-        """Analyze if medication needs refill"""
+    def _analyze_refill_needs(self, medications: list[Medication], now: datetime) -> list[RefillRecommendation]:
+        """
+        Analyze which medications need refills.
 
-        # Calculate days until medication runs out
-        if medication.last_filled_date and medication.next_refill_due:
-            last_filled = datetime.fromisoformat(medication.last_filled_date)
-            next_due = datetime.fromisoformat(medication.next_refill_due)
-            today = datetime.now()
+        Supply and refill fields are extracted into columns once and evaluated
+        as arrays; only the recommendations themselves are built per medication.
+        """
 
-            days_until_out = (next_due - today).days
-        else:
-            # If no fill date, assume mid-supply
-            days_until_out = medication.days_supply // 2
-
-        # Determine if refill needed
-        needs_refill = days_until_out <= 7  # Refill within 7 days
-
-        # Determine urgency
-        if days_until_out <= 0:
-            urgency = "urgent"
-            recommendation = "Medication supply exhausted - immediate refill needed"
-        elif days_until_out <= 3:
-            urgency = "urgent"
-            recommendation = f"Refill needed within {days_until_out} days"
-        elif days_until_out <= 7:
-            urgency = "soon"
-            recommendation = f"Refill recommended within {days_until_out} days"
-        else:
-            urgency = "routine"
-            recommendation = f"No immediate refill needed ({days_until_out} days remaining)"
+        count = len(medications)
+        if not count:
+            return []
 
-        # Check if can auto-approve
-        can_auto_approve = (
-            medication.refills_remaining > 0 and
-            medication.status == MedicationStatus.ACTIVE and
-            urgency in ["routine", "soon"]
-        )
+        now_us = _epoch_microseconds(now)
 
-        auto_approve_reason = None
-        if can_auto_approve:
-            auto_approve_reason = f"Refills remaining ({medication.refills_remaining}), routine request"
+        def column(values: Iterable[Any], dtype: Any = np.bool_) -> np.ndarray:
+            return np.fromiter(values, dtype=dtype, count=count)
 
-        requires_provider = (
-            medication.refills_remaining == 0 or
-            urgency == "urgent" or
-            medication.status != MedicationStatus.ACTIVE
+        # Calculate days until medication runs out
+        has_fill_dates = column(
+            m._last_filled_us is not None and m._next_refill_due_us is not None for m in medications
         )
+        next_due_us = column(
+            (now_us if m._next_refill_due_us is None else m._next_refill_due_us for m in medications),
+            dtype=np.int64
+        )
+        days_supply = column((m.days_supply for m in medications), dtype=np.int64)
 
-        return RefillRecommendation(
-            medication_id=medication.medication_id,
-            medication_name=f"{medication.name} {medication.dosage}",
-            needs_refill=needs_refill,
-            days_until_out=days_until_out,
-            refills_remaining=medication.refills_remaining,
-            recommendation=recommendation,
-            urgency=urgency,
-            can_auto_approve=can_auto_approve,
-            auto_approve_reason=auto_approve_reason,
-            requires_provider_approval=requires_provider
+        # If no fill date, assume mid-supply
+        days_until_out = np.where(
+            has_fill_dates, (next_due_us - now_us) // MICROSECONDS_PER_DAY, days_supply // 2
         )
 
+        # Determine if refill needed (within 7 days) and urgency
+        needs_refill = days_until_out <= REFILL_DAY_THRESHOLDS[-1]
+        bucket = np.searchsorted(REFILL_DAY_THRESHOLDS, days_until_out)
+        urgent = days_until_out <= REFILL_DAY_THRESHOLDS[1]
+
+        # Check if can auto-approve (refills remaining, routine or soon)
+        refills_remaining = column((m.refills_remaining for m in medications), dtype=np.int64)
+        active = column(m.status is MedicationStatus.ACTIVE for m in medications)
+        can_auto_approve = (refills_remaining > 0) & active & ~urgent
+        requires_provider = (refills_remaining == 0) | urgent | ~active
+
+        return [
+            _refill_recommendation_cached(
+                med.medication_id, med.display_name, med.refills_remaining, *factors
+            )
+            for med, *factors in zip(
+                medications,
+                days_until_out.tolist(),
+                bucket.tolist(),
+                needs_refill.tolist(),
+                can_auto_approve.tolist(),
+                requires_provider.tolist(),
+                strict=True
+            )
+        ]
+
     async def _request_refills(
         self,
         input_data: PrescriptionManagementInput,
@@ -373,24 +598,27 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         """Process refill requests"""
 
         patient = input_data.patient_profile
-        refill_results = []
+        now = datetime.now()
+        request_timestamp = now.strftime("%Y%m%d%H%M%S")
+
+        med_by_id = patient.medications_by_id
 
+        # Process refills concurrently (each will involve pharmacy/prescriber calls in production)
+        pending = []
         for request in input_data.refill_requests:
             # Find medication
-            med = next(
-                (m for m in patient.current_medications if m.medication_id == request.medication_id),
-                None
-            )
+            med = med_by_id.get(request.medication_id)
 
             if not med:
                 continue
 
-            # Process refill
-            result = await self._process_refill_request(request, med, patient)
-            refill_results.append(result)
+            pending.append(self._process_refill_request(request, med, patient, now, request_timestamp))
+
+        refill_results = list(await asyncio.gather(*pending))
 
         # Check for issues
-        issues = self._check_for_issues(patient.current_medications, patient.allergies)
+        active_meds = patient.active_medications
+        issues = self._check_for_issues(active_meds, patient.allergies_lower)
 
         # Generate summary
         summary = f"Processed {len(refill_results)} refill request(s)"
@@ -399,9 +627,7 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
             summary += f", {approved} approved"
 
         # Next steps
-        next_steps = []
-        for result in refill_results:
-            next_steps.extend(result.next_steps)
+        next_steps = list(chain.from_iterable(result.next_steps for result in refill_results))
 
         if len(issues) > 0:
             next_steps.append(f"Review {len(issues)} detected medication issue(s)")
@@ -427,7 +653,9 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         self,
         request: RefillRequest,
         medication: Medication,
-        patient: PatientProfile
+        patient: PatientProfile,
+        now: datetime,
+        request_timestamp: str
     ) -> RefillResult:
         """Process individual refill request"""
 
@@ -435,16 +663,16 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         can_auto_approve = (
             request.auto_approve_eligible and
             medication.refills_remaining > 0 and
-            medication.status == MedicationStatus.ACTIVE
+            medication.status is MedicationStatus.ACTIVE
         )
 
         if can_auto_approve:
             # Auto-approve and send to pharmacy
             status = RefillStatus.SENT_TO_PHARMACY
-            request_id = f"RX-{request.medication_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            request_id = f"RX-{request.medication_id}-{request_timestamp}-{next(_refill_sequence)}"
 
             pharmacy_notified = bool(patient.preferred_pharmacy)
-            estimated_ready = (datetime.now() + timedelta(hours=24)).strftime("%Y-%m-%d")
+            estimated_ready = (now + timedelta(hours=24)).strftime("%Y-%m-%d")
 
             next_steps = [
                 "Refill approved automatically",
@@ -453,9 +681,9 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
                 "Notify patient when ready for pickup"
             ]
 
-            return RefillResult(
+            return RefillResult.model_construct(
                 medication_id=medication.medication_id,
-                medication_name=f"{medication.name} {medication.dosage}",
+                medication_name=medication.display_name,
                 request_status=status,
                 request_id=request_id,
                 approval_needed=False,
@@ -475,9 +703,9 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
                 "Notify patient of approval status within 24-48 hours"
             ]
 
-            return RefillResult(
+            return RefillResult.model_construct(
                 medication_id=medication.medication_id,
-                medication_name=f"{medication.name} {medication.dosage}",
+                medication_name=medication.display_name,
                 request_status=status,
                 request_id=None,
                 approval_needed=True,
@@ -497,26 +725,20 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         patient = input_data.patient_profile
         period_days = input_data.adherence_period_days
 
-        adherence_analyses = []
-
-        for med in patient.current_medications:
-            if med.status != MedicationStatus.ACTIVE:
-                continue
-
-            analysis = self._analyze_adherence(med, period_days)
-            adherence_analyses.append(analysis)
+        active_meds = patient.active_medications
+        adherence_analyses = self._analyze_adherence(active_meds, period_days, datetime.now())
 
         # Calculate overall adherence
-        if adherence_analyses:
-            overall_adherence = sum(a.adherence_rate for a in adherence_analyses) / len(adherence_analyses)
-        else:
-            overall_adherence = None
+        rates = np.fromiter(
+            (a.adherence_rate for a in adherence_analyses), dtype=np.float64, count=len(adherence_analyses)
+        )
+        overall_adherence = float(rates.mean()) if rates.size else None
 
         # Identify adherence issues
         issues = []
         for analysis in adherence_analyses:
             if analysis.adherence_level == AdherenceLevel.POOR:
-                issues.append(MedicationIssue(
+                issues.append(MedicationIssue.model_construct(
                     issue_type="adherence_problem",
                     severity="medium",
                     medications_involved=[analysis.medication_name],
@@ -532,7 +754,8 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         else:
             summary = "No active medications to analyze. "
 
-        poor_adherence = sum(1 for a in adherence_analyses if a.adherence_level == AdherenceLevel.POOR)
+        # Poor adherence is below the lowest level threshold
+        poor_adherence = int(np.count_nonzero(rates < ADHERENCE_LEVEL_THRESHOLDS[0]))
         if poor_adherence > 0:
             summary += f"{poor_adherence} medication(s) with poor adherence."
 
@@ -564,8 +787,13 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
             needs_human_review=(poor_adherence > 0)
         )
 
-    def _analyze_adherence(self, medication: Medication, period_days: int) -> AdherenceAnalysis:
-        """Analyze adherence for single medication"""
+    def _analyze_adherence(
+        self,
+        medications: list[Medication],
+        period_days: int,
+        now: datetime
+    ) -> list[AdherenceAnalysis]:
+        """Analyze adherence for each medication"""
 
         # In production, this would:
         # 1. Query prescription fill history
@@ -576,70 +804,40 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         # Mock adherence calculation
         # Use days_supply and refill pattern to estimate
 
-        if medication.last_filled_date:
-            last_filled = datetime.fromisoformat(medication.last_filled_date)
-            days_since_fill = (datetime.now() - last_filled).days
-
-            # Estimate adherence based on refill timing
-            expected_refill_day = medication.days_supply
-            if days_since_fill <= expected_refill_day:
-                adherence_rate = 0.95  # On time
-                refill_pattern = "consistent"
-            elif days_since_fill <= expected_refill_day * 1.2:
-                adherence_rate = 0.80  # Slightly late
-                refill_pattern = "irregular"
-            else:
-                adherence_rate = 0.60  # Very late
-                refill_pattern = "declining"
-        else:
-            # No fill data, assume moderate adherence
-            adherence_rate = 0.75
-            refill_pattern = "unknown"
-
-        # Determine adherence level
-        if adherence_rate >= 0.90:
-            level = AdherenceLevel.EXCELLENT
-        elif adherence_rate >= 0.80:
-            level = AdherenceLevel.GOOD
-        elif adherence_rate >= 0.60:
-            level = AdherenceLevel.FAIR
-        else:
-            level = AdherenceLevel.POOR
+        count = len(medications)
+        if not count:
+            return []
+
+        now_us = _epoch_microseconds(now)
+
+        has_fill = np.fromiter((m._last_filled_us is not None for m in medications), dtype=np.bool_, count=count)
+        last_filled_us = np.fromiter(
+            (now_us if m._last_filled_us is None else m._last_filled_us for m in medications),
+            dtype=np.int64,
+            count=count
+        )
+        days_since_fill = (now_us - last_filled_us) // MICROSECONDS_PER_DAY
+        days_supply = np.fromiter((m.days_supply for m in medications), dtype=np.int64, count=count)
+
+        # Estimate adherence based on refill timing (no fill data: assume moderate adherence)
+        timing = np.select(
+            [~has_fill, days_since_fill <= days_supply, days_since_fill <= days_supply * LATE_REFILL_FACTOR],
+            [3, 0, 1],
+            default=2
+        )
+        adherence_rates = ADHERENCE_RATES[timing]
+        level_index = np.searchsorted(ADHERENCE_LEVEL_THRESHOLDS, adherence_rates, side="right")
 
         # Estimate doses
         # Assume medication taken daily (simplification)
-        doses_prescribed = period_days
-        doses_taken = int(doses_prescribed * adherence_rate)
-        doses_missed = doses_prescribed - doses_taken
-
-        # Identify potential barriers
-        barriers = []
-        if adherence_rate < 0.80:
-            if refill_pattern == "irregular":
-                barriers.append("Inconsistent refill pattern")
-            if refill_pattern == "declining":
-                barriers.append("Declining adherence over time")
-
-        # Recommendations
-        recommendations = []
-        if adherence_rate < 0.80:
-            recommendations.append("Set up medication reminders")
-            recommendations.append("Discuss barriers with patient")
-            if refill_pattern == "irregular":
-                recommendations.append("Offer auto-refill program")
-
-        return AdherenceAnalysis(
-            medication_id=medication.medication_id,
-            medication_name=f"{medication.name} {medication.dosage}",
-            adherence_rate=adherence_rate,
-            adherence_level=level,
-            doses_prescribed=doses_prescribed,
-            doses_taken_estimated=doses_taken,
-            doses_missed_estimated=doses_missed,
-            refill_pattern=refill_pattern,
-            barriers_identified=barriers,
-            recommendations=recommendations
-        )
+        doses_taken = (period_days * adherence_rates).astype(np.int64)
+
+        return [
+            _adherence_analysis_cached(med.medication_id, med.display_name, period_days, *factors)
+            for med, *factors in zip(
+                medications, timing.tolist(), level_index.tolist(), doses_taken.tolist(), strict=True
+            )
+        ]
 
     async def _detect_issues(
         self,
@@ -650,7 +848,8 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
 
         patient = input_data.patient_profile
 
-        issues = self._check_for_issues(patient.current_medications, patient.allergies)
+        active_meds = patient.active_medications
+        issues = self._check_for_issues(active_meds, patient.allergies_lower)
 
         # Generate summary
         if len(issues) == 0:
@@ -695,22 +894,32 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
 
     def _check_for_issues(
         self,
-        medications: list[Medication],
-        allergies: list[str]
+        active_meds: list[Medication],
+        allergies_lower: list[tuple[str, str]]
     ) -> list[MedicationIssue]:
-        """Check for medication issues"""
+        """
+        Check active medications for issues
 
-        issues = []
+        Allergy and duplicate therapy checks share a single pass over the
+        medications; allergy issues are reported first.
+        """
 
-        # Check for allergy concerns
-        for med in medications:
-            if med.status != MedicationStatus.ACTIVE:
-                continue
+        # Allergies need at least one medication and duplicates need two
+        if len(active_meds) < (1 if allergies_lower else 2):
+            return []
 
-            for allergy in allergies:
+        allergy_issues = []
+        duplicate_issues = []
+        med_classes = {}  # Would map to drug classes in production
+
+        for med in active_meds:
+            name_lower = med.name_lower
+
+            # Check for allergy concerns
+            for allergy, allergy_lower in allergies_lower:
                 # Simple string matching (production would use drug database)
-                if allergy.lower() in med.name.lower():
-                    issues.append(MedicationIssue(
+                if allergy_lower in name_lower:
+                    allergy_issues.append(MedicationIssue.model_construct(
                         issue_type="allergy_concern",
                         severity="critical",
                         medications_involved=[med.name],
@@ -720,15 +929,11 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
                         requires_immediate_attention=True
                     ))
 
-        # Check for duplicate therapy
-        active_meds = [m for m in medications if m.status == MedicationStatus.ACTIVE]
-        med_classes = {}  # Would map to drug classes in production
-
-        for med in active_meds:
+            # Check for duplicate therapy
             # Simplified: check for same drug name (would use drug class in production)
-            base_name = med.name.split()[0].lower() if med.name else ""
+            base_name = med.base_name
             if base_name in med_classes:
-                issues.append(MedicationIssue(
+                duplicate_issues.append(MedicationIssue.model_construct(
                     issue_type="duplicate_therapy",
                     severity="medium",
                     medications_involved=[med_classes[base_name], med.name],
@@ -740,7 +945,7 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
             else:
                 med_classes[base_name] = med.name
 
-        return issues
+        return allergy_issues + duplicate_issues
 
     def _generate_refill_summary(
         self,
@@ -774,25 +979,28 @@ class PrescriptionManagementAgent(BaseAgent[PrescriptionManagementInput, Prescri
         """Determine next steps for refills"""
 
         steps = []
+        routine = 0
+        needs_approval = 0
 
-        # Handle urgent refills first
-        urgent = [r for r in needs_refill if r.urgency == "urgent"]
-        if urgent:
-            for rec in urgent:
+        # Handle urgent refills first; count routine and approval-needed refills in the same pass
+        for rec in needs_refill:
+            if rec.urgency == "urgent":
                 if rec.can_auto_approve:
                     steps.append(f"Process urgent refill for {rec.medication_name}")
                 else:
                     steps.append(f"⚠️ Contact prescriber for urgent refill: {rec.medication_name}")
+                continue
+
+            routine += rec.can_auto_approve
+            needs_approval += rec.requires_provider_approval
 
         # Handle routine refills
-        routine = [r for r in needs_refill if r.can_auto_approve and r.urgency != "urgent"]
         if routine:
-            steps.append(f"Auto-approve {len(routine)} routine refill(s)")
+            steps.append(f"Auto-approve {routine} routine refill(s)")
 
         # Handle those needing provider approval
-        needs_approval = [r for r in needs_refill if r.requires_provider_approval and r.urgency != "urgent"]
         if needs_approval:
-            steps.append(f"Request provider approval for {len(needs_approval)} refill(s)")
+            steps.append(f"Request provider approval for {needs_approval} refill(s)")
 
         # Handle detected issues
         if issues:
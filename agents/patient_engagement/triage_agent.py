@@ -5,12 +5,30 @@ Performs intelligent symptom assessment, determines care urgency, and routes
 patients to appropriate care levels with safety-first algorithms.
 """
 
+import asyncio
+import os
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Optional, Literal
+import httpx
+import numpy as np
 from pydantic import BaseModel, Field
 from enum import Enum
 
+try:
+    from anthropic import AsyncAnthropic
+except ImportError:
+    AsyncAnthropic = None
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+
 from platform_core.agents.base_agent import BaseAgent
+from platform_core.shared_services.http_client import get_shared_http_client
+from platform_core.shared_services.keyword_scanner import KeywordScanner
 
 
 # ============================================================================
@@ -149,6 +167,167 @@ class TriageOutput(BaseModel):
     needs_human_review: bool
 
 
+# ============================================================================
+# Triage Keywords
+# ============================================================================
+
+
+# Emergency red flag keywords (the first one found, in this order, is reported)
+EMERGENCY_KEYWORDS = (
+    "chest pain", "crushing", "radiating", "shortness of breath", "severe",
+    "can't breathe", "stroke", "paralysis", "slurred speech", "confusion",
+    "severe bleeding", "uncontrolled", "head injury", "unconscious",
+    "seizure", "overdose", "poisoning", "severe burn",
+    "suicidal", "kill myself", "end my life", "suicide plan"
+)
+
+# Chest pain with any cardiac warning sign is a possible heart attack
+CHEST_PAIN_TERMS = frozenset({"chest pain", "chest pressure", "chest tightness"})
+CARDIAC_FLAGS = frozenset({"radiating", "arm", "jaw", "shortness of breath", "sweating", "nausea"})
+
+# Stroke warning signs (FAST)
+STROKE_INDICATORS = frozenset({"facial drooping", "arm weakness", "slurred speech", "sudden confusion"})
+
+PREGNANCY_WARNING_TERMS = frozenset({"bleeding"})
+
+SUICIDE_KEYWORDS = frozenset({
+    "suicide", "suicidal", "kill myself", "end my life",
+    "want to die", "better off dead", "suicide plan"
+})
+SUICIDE_PLAN_TERMS = frozenset({"plan", "method", "how to"})
+SUICIDE_INTENT_TERMS = frozenset({"going to", "will", "tonight", "soon"})
+
+# Depressive symptoms screened when there is no suicidal ideation
+MENTAL_HEALTH_TERMS = frozenset({"depression", "hopeless", "worthless"})
+
+# Differential diagnosis rules (simplified for demo), in order of preference: a
+# diagnosis is suggested when any of its trigger terms is found
+DIFFERENTIAL_RULES = (
+    (
+        frozenset({"fever", "cough", "congestion"}),
+        {
+            "condition": "Upper Respiratory Infection",
+            "probability": 0.75,
+            "supporting_symptoms": ("fever", "cough", "congestion"),
+            "key_differentiators": ("Duration < 10 days", "Gradual onset")
+        }
+    ),
+    (
+        frozenset({"headache"}),
+        {
+            "condition": "Tension Headache",
+            "probability": 0.60,
+            "supporting_symptoms": ("headache", "stress"),
+            "key_differentiators": ("Bilateral", "Band-like pressure")
+        }
+    )
+)
+MAX_DIFFERENTIALS = 3
+
+# Single scanner over every keyword above, so the triage text is searched once per assessment
+_keyword_scanner = KeywordScanner([
+    *EMERGENCY_KEYWORDS,
+    *CHEST_PAIN_TERMS,
+    *CARDIAC_FLAGS,
+    *STROKE_INDICATORS,
+    *PREGNANCY_WARNING_TERMS,
+    *SUICIDE_KEYWORDS,
+    *SUICIDE_PLAN_TERMS,
+    *SUICIDE_INTENT_TERMS,
+    *MENTAL_HEALTH_TERMS,
+    *(term for terms, _ in DIFFERENTIAL_RULES for term in terms)
+])
+
+
+# ============================================================================
+# Care Routing Tables
+# ============================================================================
+
+
+CRISIS_RESOURCES = """
+🚨 IMMEDIATE HELP AVAILABLE:
+
+• 988 Suicide & Crisis Lifeline: Call or text 988 (24/7)
+• Crisis Text Line: Text HOME to 741741
+• Emergency: Call 911
+• Do not leave patient alone
+"""
+
+ESTIMATED_WAIT_TIMES = {
+    CareUrgency.EMERGENCY: "Immediate",
+    CareUrgency.URGENT: "2-4 hours",
+    CareUrgency.PROMPT: "24-48 hours",
+    CareUrgency.ROUTINE: "1-2 weeks",
+    CareUrgency.SELF_CARE: "N/A"
+}
+
+# Urgencies that need a provider callback
+CALLBACK_URGENCIES = frozenset({CareUrgency.EMERGENCY, CareUrgency.URGENT})
+
+# Suicide risk levels that need immediate intervention
+HIGH_SUICIDE_RISK_LEVELS = frozenset({"high", "imminent"})
+
+# System next steps by care urgency (other urgencies use the routine steps)
+URGENCY_NEXT_STEPS = {
+    CareUrgency.EMERGENCY: (
+        "🚨 CRITICAL: Immediate provider notification",
+        "Provide patient with 911 instructions",
+        "Document emergency triage in medical record"
+    ),
+    CareUrgency.URGENT: (
+        "Notify care team for same-day scheduling",
+        "Send urgent care instructions to patient",
+        "Schedule provider callback within 1 hour"
+    )
+}
+ROUTINE_NEXT_STEPS = (
+    "Send care instructions to patient",
+    "Offer scheduling options based on urgency",
+    "Add to provider review queue"
+)
+CRISIS_NEXT_STEPS = (
+    "🚨 CRISIS: Immediate mental health crisis intervention",
+    "Contact emergency services and crisis team"
+)
+
+
+# ============================================================================
+# LLM Clients
+# ============================================================================
+
+
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+
+def _get_anthropic_client() -> Optional["AsyncAnthropic"]:
+    """Get the shared Anthropic client (None if the SDK is not installed)"""
+    if AsyncAnthropic is None:
+        return None
+    return _anthropic_client_for(get_shared_http_client())
+
+
+def _get_openai_client() -> Optional["AsyncOpenAI"]:
+    """Get the shared OpenAI client (None if the SDK is not installed)"""
+    if AsyncOpenAI is None:
+        return None
+    return _openai_client_for(get_shared_http_client())
+
+
+# Keyed on the shared HTTP client, so a client recreated after
+# close_shared_http_client() gets fresh SDK clients instead of closed ones
+@lru_cache(maxsize=1)
+def _anthropic_client_for(http_client: httpx.AsyncClient) -> "AsyncAnthropic":
+    """Build the Anthropic client for a shared HTTP client"""
+    return AsyncAnthropic(api_key=ANTHROPIC_API_KEY, http_client=http_client)
+
+
+@lru_cache(maxsize=1)
+def _openai_client_for(http_client: httpx.AsyncClient) -> "AsyncOpenAI":
+    """Build the OpenAI client for a shared HTTP client"""
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+
+
 # ============================================================================
 # Agent Implementation
 # ============================================================================
@@ -175,33 +354,21 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
     """
 
     # Emergency red flag keywords
-    EMERGENCY_KEYWORDS = [
-        "chest pain", "crushing", "radiating", "shortness of breath", "severe",
-        "can't breathe", "stroke", "paralysis", "slurred speech", "confusion",
-        "severe bleeding", "uncontrolled", "head injury", "unconscious",
-        "seizure", "overdose", "poisoning", "severe burn",
-        "suicidal", "kill myself", "end my life", "suicide plan"
-    ]
+    EMERGENCY_KEYWORDS = EMERGENCY_KEYWORDS
 
     def __init__(self, llm_provider: str = "anthropic"):
         super().__init__()
         self.llm_provider = llm_provider
 
-        # Initialize LLM clients
-        if llm_provider == "anthropic":
-            try:
-                from anthropic import AsyncAnthropic
-                import os
-                self.anthropic_client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-            except ImportError:
-                self.anthropic_client = None
-        else:
-            try:
-                from openai import AsyncOpenAI
-                import os
-                self.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-            except ImportError:
-                self.openai_client = None
+    @property
+    def anthropic_client(self) -> Optional["AsyncAnthropic"]:
+        """Process-wide Anthropic client on the live shared connection pool"""
+        return _get_anthropic_client() if self.llm_provider == "anthropic" else None
+
+    @property
+    def openai_client(self) -> Optional["AsyncOpenAI"]:
+        """Process-wide OpenAI client on the live shared connection pool"""
+        return _get_openai_client() if self.llm_provider != "anthropic" else None
 
     async def _execute_internal(
         self,
@@ -210,28 +377,39 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
     ) -> TriageOutput:
         """Execute triage assessment workflow"""
 
-        triage_id = f"TRIAGE-{input_data.patient_context.patient_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        now = datetime.now()
+        triage_id = f"TRIAGE-{input_data.patient_context.patient_id}-{now.strftime('%Y%m%d%H%M%S')}"
+
+        # Keywords in the lowercased complaint and symptoms, searched once for every keyword check
+        keywords = _keyword_scanner.scan(self._combine_text(input_data))
+
+        # Symptom severities, extracted once for the red flag and urgency checks
+        severities = np.fromiter(
+            (s.severity for s in input_data.symptoms), dtype=np.int64, count=len(input_data.symptoms)
+        )
 
         # Step 1: Immediate safety check (red flags)
-        red_flags = self._detect_red_flags(input_data)
+        red_flags = self._detect_red_flags(input_data, keywords, severities)
 
         # Step 2: Safety assessment (suicide risk)
-        safety_assessment = self._assess_safety(input_data)
+        safety_assessment = self._assess_safety(keywords)
 
         # Step 3: Vital signs assessment if available
         vitals_concerning = self._assess_vital_signs(input_data.patient_context)
 
-        # Step 4: Determine care urgency
-        care_recommendation = await self._determine_care_urgency(
-            input_data,
-            red_flags,
-            safety_assessment,
-            vitals_concerning
+        # Steps 4-5: Determine care urgency and generate differential diagnoses
+        # (independent of each other, so run concurrently)
+        care_recommendation, differential_dx = await asyncio.gather(
+            self._determine_care_urgency(
+                input_data,
+                red_flags,
+                safety_assessment,
+                vitals_concerning,
+                severities
+            ),
+            self._generate_differential_diagnoses(keywords)
         )
 
-        # Step 5: Generate differential diagnoses
-        differential_dx = await self._generate_differential_diagnoses(input_data)
-
         # Step 6: Generate clinical summary
         clinical_summary = self._generate_clinical_summary(input_data, care_recommendation)
 
@@ -240,7 +418,8 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             input_data,
             care_recommendation,
             red_flags,
-            differential_dx
+            differential_dx,
+            now
         )
 
         # Step 8: Generate patient instructions
@@ -260,16 +439,21 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             care_recommendation
         )
 
+        has_red_flags = bool(red_flags)
+        high_suicide_risk = (
+            safety_assessment is not None and
+            safety_assessment.suicide_risk_level in HIGH_SUICIDE_RISK_LEVELS
+        )
         requires_callback = (
-            care_recommendation.urgency in [CareUrgency.EMERGENCY, CareUrgency.URGENT] or
-            len(red_flags) > 0 or
-            (safety_assessment and safety_assessment.suicide_risk_level in ["high", "imminent"])
+            care_recommendation.urgency in CALLBACK_URGENCIES or
+            has_red_flags or
+            high_suicide_risk
         )
 
         return TriageOutput(
             success=True,
             triage_id=triage_id,
-            assessment_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            assessment_date=now.strftime("%Y-%m-%d %H:%M:%S"),
             care_recommendation=care_recommendation,
             differential_diagnoses=differential_dx,
             red_flags=red_flags,
@@ -281,64 +465,68 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             next_steps=next_steps,
             patient_instructions=patient_instructions,
             confidence=confidence,
-            needs_human_review=(len(red_flags) > 0 or requires_callback)
+            needs_human_review=(has_red_flags or requires_callback)
         )
 
-    def _detect_red_flags(self, input_data: TriageInput) -> list[RedFlag]:
-        """Detect emergency red flags"""
+    def _combine_text(self, input_data: TriageInput) -> str:
+        """Chief complaint and symptom descriptions as one lowercase string"""
+        symptoms = " ".join(s.symptom for s in input_data.symptoms)
+        return f"{input_data.chief_complaint} {symptoms}".lower()
 
-        red_flags = []
+    def _detect_red_flags(
+        self,
+        input_data: TriageInput,
+        found: set[str],
+        severities: np.ndarray
+    ) -> list[RedFlag]:
+        """Detect emergency red flags from the triage keywords found and the symptom severities"""
 
-        complaint_lower = input_data.chief_complaint.lower()
-        all_symptoms = " ".join([s.symptom.lower() for s in input_data.symptoms])
-        combined_text = complaint_lower + " " + all_symptoms
+        red_flags = []
 
-        # Check for emergency keywords
-        for keyword in self.EMERGENCY_KEYWORDS:
-            if keyword in combined_text:
+        # Keyword checks only apply when some triage keyword was found
+        if found:
+            # Check for emergency keywords (one emergency flag is enough)
+            keyword = next((keyword for keyword in self.EMERGENCY_KEYWORDS if keyword in found), None)
+            if keyword is not None:
                 red_flags.append(RedFlag(
                     flag_type="emergency_symptom",
                     description=f"Emergency keyword detected: '{keyword}'",
                     recommendation="Immediate emergency evaluation required - call 911",
                     severity="critical"
                 ))
-                break  # One emergency flag is enough
 
-        # Check for chest pain red flags
-        if any(term in combined_text for term in ["chest pain", "chest pressure", "chest tightness"]):
-            # Check for cardiac red flags
-            cardiac_flags = ["radiating", "arm", "jaw", "shortness of breath", "sweating", "nausea"]
-            if any(flag in combined_text for flag in cardiac_flags):
+            # Check for chest pain red flags
+            if not found.isdisjoint(CHEST_PAIN_TERMS):
+                # Check for cardiac red flags
+                if not found.isdisjoint(CARDIAC_FLAGS):
+                    red_flags.append(RedFlag(
+                        flag_type="cardiac_emergency",
+                        description="Chest pain with cardiac warning signs",
+                        recommendation="Call 911 immediately - possible heart attack",
+                        severity="critical"
+                    ))
+
+            # Check for stroke red flags (FAST)
+            if not found.isdisjoint(STROKE_INDICATORS):
                 red_flags.append(RedFlag(
-                    flag_type="cardiac_emergency",
-                    description="Chest pain with cardiac warning signs",
-                    recommendation="Call 911 immediately - possible heart attack",
+                    flag_type="stroke_warning",
+                    description="Stroke warning signs detected",
+                    recommendation="Call 911 immediately - time is critical for stroke",
                     severity="critical"
                 ))
 
-        # Check for stroke red flags (FAST)
-        stroke_indicators = ["facial drooping", "arm weakness", "slurred speech", "sudden confusion"]
-        if any(indicator in combined_text for indicator in stroke_indicators):
+        # Check for severe pain
+        for index in np.flatnonzero(severities >= 8).tolist():
+            symptom = input_data.symptoms[index]
             red_flags.append(RedFlag(
-                flag_type="stroke_warning",
-                description="Stroke warning signs detected",
-                recommendation="Call 911 immediately - time is critical for stroke",
-                severity="critical"
+                flag_type="severe_pain",
+                description=f"Severe {symptom.symptom} (severity {symptom.severity}/10)",
+                recommendation="Urgent medical evaluation required",
+                severity="high"
             ))
 
-        # Check for severe pain
-        severe_symptoms = [s for s in input_data.symptoms if s.severity >= 8]
-        if severe_symptoms:
-            for symptom in severe_symptoms:
-                red_flags.append(RedFlag(
-                    flag_type="severe_pain",
-                    description=f"Severe {symptom.symptom} (severity {symptom.severity}/10)",
-                    recommendation="Urgent medical evaluation required",
-                    severity="high"
-                ))
-
         # Check for high-risk patient groups
-        if input_data.patient_context.pregnant and "bleeding" in combined_text:
+        if input_data.patient_context.pregnant and not found.isdisjoint(PREGNANCY_WARNING_TERMS):
             red_flags.append(RedFlag(
                 flag_type="pregnancy_emergency",
                 description="Bleeding during pregnancy",
@@ -359,24 +547,19 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
 
         return red_flags
 
-    def _assess_safety(self, input_data: TriageInput) -> Optional[SafetyAssessment]:
-        """Assess suicide risk"""
+    def _assess_safety(self, found: set[str]) -> Optional[SafetyAssessment]:
+        """Assess suicide risk from the triage keywords found in the complaint and symptoms"""
 
-        complaint_lower = input_data.chief_complaint.lower()
-        all_symptoms = " ".join([s.symptom.lower() for s in input_data.symptoms])
-        combined_text = complaint_lower + " " + all_symptoms
+        # No triage keyword, nothing to screen
+        if not found:
+            return None
 
         # Check for suicide keywords
-        suicide_keywords = [
-            "suicide", "suicidal", "kill myself", "end my life",
-            "want to die", "better off dead", "suicide plan"
-        ]
-
-        has_suicide_ideation = any(keyword in combined_text for keyword in suicide_keywords)
+        has_suicide_ideation = not found.isdisjoint(SUICIDE_KEYWORDS)
 
         if not has_suicide_ideation:
             # Quick mental health screening
-            if any(term in combined_text for term in ["depression", "hopeless", "worthless"]):
+            if not found.isdisjoint(MENTAL_HEALTH_TERMS):
                 return SafetyAssessment(
                     requires_immediate_intervention=False,
                     suicide_risk_level="low",
@@ -387,8 +570,14 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             return None
 
         # Suicide ideation detected - assess severity
-        has_plan = any(term in combined_text for term in ["plan", "method", "how to"])
-        has_intent = any(term in combined_text for term in ["going to", "will", "tonight", "soon"])
+        has_plan = not found.isdisjoint(SUICIDE_PLAN_TERMS)
+        has_intent = not found.isdisjoint(SUICIDE_INTENT_TERMS)
+
+        risk_factors = ["Active suicidal ideation"]
+        if has_plan:
+            risk_factors.append("Suicide plan")
+        if has_intent:
+            risk_factors.append("Expressed intent")
 
         if has_plan and has_intent:
             risk_level = "imminent"
@@ -397,70 +586,47 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
         else:
             risk_level = "moderate"
 
-        crisis_resources = """
-🚨 IMMEDIATE HELP AVAILABLE:
-
-• 988 Suicide & Crisis Lifeline: Call or text 988 (24/7)
-• Crisis Text Line: Text HOME to 741741
-• Emergency: Call 911
-• Do not leave patient alone
-"""
-
         return SafetyAssessment(
-            requires_immediate_intervention=(risk_level in ["high", "imminent"]),
+            requires_immediate_intervention=(risk_level in HIGH_SUICIDE_RISK_LEVELS),
             suicide_risk_level=risk_level,
-            risk_factors=[
-                "Active suicidal ideation",
-                "Suicide plan" if has_plan else None,
-                "Expressed intent" if has_intent else None
-            ],
+            risk_factors=risk_factors,
             protective_factors=[],  # Would be assessed in full evaluation
-            crisis_resources=crisis_resources
+            crisis_resources=CRISIS_RESOURCES
         )
 
     def _assess_vital_signs(self, patient_context: PatientContext) -> bool:
         """Assess if vital signs are concerning"""
 
-        concerning = False
-
-        # Temperature
-        if patient_context.temperature_f:
-            if patient_context.temperature_f >= 103.0 or patient_context.temperature_f <= 95.0:
-                concerning = True
-
-        # Heart rate
-        if patient_context.heart_rate:
-            if patient_context.heart_rate >= 120 or patient_context.heart_rate <= 50:
-                concerning = True
-
-        # Blood pressure
-        if patient_context.blood_pressure_systolic:
-            if patient_context.blood_pressure_systolic >= 180 or patient_context.blood_pressure_systolic <= 90:
-                concerning = True
-
-        # Oxygen saturation
-        if patient_context.oxygen_saturation:
-            if patient_context.oxygen_saturation <= 92:
-                concerning = True
-
-        # Respiratory rate
-        if patient_context.respiratory_rate:
-            if patient_context.respiratory_rate >= 24 or patient_context.respiratory_rate <= 10:
-                concerning = True
-
-        return concerning
+        temperature = patient_context.temperature_f
+        heart_rate = patient_context.heart_rate
+        systolic = patient_context.blood_pressure_systolic
+        oxygen_saturation = patient_context.oxygen_saturation
+        respiratory_rate = patient_context.respiratory_rate
+
+        # Unrecorded (or zero) vitals are skipped; stops at the first concerning vital
+        return bool(
+            (temperature and (temperature >= 103.0 or temperature <= 95.0)) or
+            (heart_rate and (heart_rate >= 120 or heart_rate <= 50)) or
+            (systolic and (systolic >= 180 or systolic <= 90)) or
+            (oxygen_saturation and oxygen_saturation <= 92) or
+            (respiratory_rate and (respiratory_rate >= 24 or respiratory_rate <= 10))
+        )
 
     async def _determine_care_urgency(
         self,
         input_data: TriageInput,
         red_flags: list[RedFlag],
         safety_assessment: Optional[SafetyAssessment],
-        vitals_concerning: bool
+        vitals_concerning: bool,
+        severities: np.ndarray
     ) -> CareRecommendation:
         """Determine appropriate care urgency and level"""
 
+        # Red flag severities, collected in one pass for the checks below
+        flag_severities = {flag.severity for flag in red_flags}
+
         # Emergency conditions
-        if any(flag.severity == "critical" for flag in red_flags):
+        if "critical" in flag_severities:
             return CareRecommendation(
                 urgency=CareUrgency.EMERGENCY,
                 care_level="emergency_department",
@@ -497,7 +663,7 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             )
 
         # High urgency
-        if (any(flag.severity == "high" for flag in red_flags) or
+        if ("high" in flag_severities or
             vitals_concerning or
             (safety_assessment and safety_assessment.suicide_risk_level == "high")):
             return CareRecommendation(
@@ -519,7 +685,7 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
             )
 
         # Check severity scores
-        max_severity = max([s.severity for s in input_data.symptoms], default=0)
+        max_severity = int(severities.max()) if severities.size else 0
 
         if max_severity >= 7:
             return CareRecommendation(
@@ -580,37 +746,22 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
 
     async def _generate_differential_diagnoses(
         self,
-        input_data: TriageInput
+        found: set[str]
     ) -> list[DifferentialDiagnosis]:
-        """Generate potential diagnoses"""
+        """Generate potential diagnoses from the triage keywords found in the complaint and symptoms"""
 
         # In production, this would use medical knowledge bases and ML models
         # For now, basic pattern matching
 
-        differentials = []
-
-        complaint_lower = input_data.chief_complaint.lower()
-        symptom_text = " ".join([s.symptom.lower() for s in input_data.symptoms])
-        combined = complaint_lower + " " + symptom_text
-
-        # Common patterns (simplified for demo)
-        if any(term in combined for term in ["fever", "cough", "congestion"]):
-            differentials.append(DifferentialDiagnosis(
-                condition="Upper Respiratory Infection",
-                probability=0.75,
-                supporting_symptoms=["fever", "cough", "congestion"],
-                key_differentiators=["Duration < 10 days", "Gradual onset"]
-            ))
-
-        if "headache" in combined:
-            differentials.append(DifferentialDiagnosis(
-                condition="Tension Headache",
-                probability=0.60,
-                supporting_symptoms=["headache", "stress"],
-                key_differentiators=["Bilateral", "Band-like pressure"]
-            ))
-
-        return differentials[:3]  # Return top 3
+        # Top matching rules only
+        return list(islice(
+            (
+                DifferentialDiagnosis(**diagnosis)
+                for terms, diagnosis in DIFFERENTIAL_RULES
+                if not found.isdisjoint(terms)
+            ),
+            MAX_DIFFERENTIALS
+        ))
 
     def _generate_clinical_summary(
         self,
@@ -621,82 +772,71 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
 
         patient = input_data.patient_context
 
-        summary_parts = [
-            f"Patient: {patient.age}yo {patient.sex}",
-            f"Chief Complaint: {input_data.chief_complaint}",
-            f"Symptoms: {', '.join([f'{s.symptom} (severity {s.severity}/10)' for s in input_data.symptoms[:3]])}",
-        ]
-
-        if patient.chronic_conditions:
-            summary_parts.append(f"PMH: {', '.join(patient.chronic_conditions)}")
-
-        if patient.temperature_f:
-            summary_parts.append(f"Temp: {patient.temperature_f}°F")
-
-        summary_parts.append(f"Triage Level: {care_rec.urgency.value.upper()}")
-
-        return " | ".join(summary_parts)
+        # First three symptoms only
+        symptoms = ", ".join(
+            f"{s.symptom} (severity {s.severity}/10)" for s in islice(input_data.symptoms, 3)
+        )
+        history = f" | PMH: {', '.join(patient.chronic_conditions)}" if patient.chronic_conditions else ""
+        temperature = f" | Temp: {patient.temperature_f}°F" if patient.temperature_f else ""
+
+        return (
+            f"Patient: {patient.age}yo {patient.sex} | "
+            f"Chief Complaint: {input_data.chief_complaint} | "
+            f"Symptoms: {symptoms}{history}{temperature} | "
+            f"Triage Level: {care_rec.urgency.value.upper()}"
+        )
 
     def _generate_triage_notes(
         self,
         input_data: TriageInput,
         care_rec: CareRecommendation,
         red_flags: list[RedFlag],
-        differentials: list[DifferentialDiagnosis]
+        differentials: list[DifferentialDiagnosis],
+        now: datetime
     ) -> str:
         """Generate detailed triage notes"""
 
-        notes = []
-
-        notes.append(f"TRIAGE ASSESSMENT - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        notes.append("")
-        notes.append(f"Chief Complaint: {input_data.chief_complaint}")
-        notes.append("")
-
-        notes.append("Symptoms:")
-        for symptom in input_data.symptoms:
-            notes.append(f"  - {symptom.symptom}: {symptom.severity}/10, {symptom.onset} onset")
-        notes.append("")
+        notes = [
+            f"TRIAGE ASSESSMENT - {now:%Y-%m-%d %H:%M}",
+            "",
+            f"Chief Complaint: {input_data.chief_complaint}",
+            "",
+            "Symptoms:",
+            *(f"  - {symptom.symptom}: {symptom.severity}/10, {symptom.onset} onset" for symptom in input_data.symptoms),
+            ""
+        ]
 
         if red_flags:
-            notes.append("⚠️ RED FLAGS:")
-            for flag in red_flags:
-                notes.append(f"  - {flag.description}")
-            notes.append("")
+            notes += ["⚠️ RED FLAGS:", *(f"  - {flag.description}" for flag in red_flags), ""]
 
-        notes.append(f"Triage Level: {care_rec.urgency.value.upper()}")
-        notes.append(f"Recommended Care: {care_rec.care_level}")
-        notes.append(f"Timeframe: {care_rec.timeframe}")
-        notes.append("")
+        notes += [
+            f"Triage Level: {care_rec.urgency.value.upper()}",
+            f"Recommended Care: {care_rec.care_level}",
+            f"Timeframe: {care_rec.timeframe}",
+            ""
+        ]
 
         if differentials:
             notes.append("Differential Diagnoses:")
-            for dx in differentials:
-                notes.append(f"  - {dx.condition} ({dx.probability*100:.0f}% probability)")
+            notes += (f"  - {dx.condition} ({dx.probability*100:.0f}% probability)" for dx in differentials)
 
         return "\n".join(notes)
 
     def _generate_patient_instructions(self, care_rec: CareRecommendation) -> str:
         """Generate patient-facing instructions"""
 
-        instructions = []
-
-        instructions.append(f"Based on your symptoms, you should: {care_rec.timeframe}")
-        instructions.append("")
-
-        instructions.append("What to do now:")
-        for action in care_rec.immediate_actions:
-            instructions.append(f"• {action}")
-        instructions.append("")
-
-        instructions.append("Seek immediate care if you experience:")
-        for warning in care_rec.warning_signs:
-            instructions.append(f"⚠️ {warning}")
+        instructions = [
+            f"Based on your symptoms, you should: {care_rec.timeframe}",
+            "",
+            "What to do now:",
+            *(f"• {action}" for action in care_rec.immediate_actions),
+            "",
+            "Seek immediate care if you experience:",
+            *(f"⚠️ {warning}" for warning in care_rec.warning_signs)
+        ]
 
         if care_rec.self_care_instructions:
-            instructions.append("")
-            instructions.append("Self-care:")
-            instructions.append(care_rec.self_care_instructions)
+            instructions += ["", "Self-care:", care_rec.self_care_instructions]
 
         return "\n".join(instructions)
 
@@ -708,41 +848,22 @@ class TriageAgent(BaseAgent[TriageInput, TriageOutput]):
     ) -> list[str]:
         """Determine system next steps"""
 
-        steps = []
-
-        if care_rec.urgency == CareUrgency.EMERGENCY:
-            steps.append("🚨 CRITICAL: Immediate provider notification")
-            steps.append("Provide patient with 911 instructions")
-            steps.append("Document emergency triage in medical record")
-        elif care_rec.urgency == CareUrgency.URGENT:
-            steps.append("Notify care team for same-day scheduling")
-            steps.append("Send urgent care instructions to patient")
-            steps.append("Schedule provider callback within 1 hour")
-        else:
-            steps.append("Send care instructions to patient")
-            steps.append("Offer scheduling options based on urgency")
-            steps.append("Add to provider review queue")
-
-        if safety_assessment and safety_assessment.suicide_risk_level in ["high", "imminent"]:
-            steps.insert(0, "🚨 CRISIS: Immediate mental health crisis intervention")
-            steps.insert(1, "Contact emergency services and crisis team")
-
-        steps.append("Log triage assessment in audit trail")
+        # Crisis intervention comes before everything else
+        high_suicide_risk = (
+            safety_assessment is not None and
+            safety_assessment.suicide_risk_level in HIGH_SUICIDE_RISK_LEVELS
+        )
 
-        return steps
+        return [
+            *(CRISIS_NEXT_STEPS if high_suicide_risk else ()),
+            *URGENCY_NEXT_STEPS.get(care_rec.urgency, ROUTINE_NEXT_STEPS),
+            "Log triage assessment in audit trail"
+        ]
 
     def _estimate_wait_time(self, care_rec: CareRecommendation) -> Optional[str]:
         """Estimate wait time for care"""
 
-        wait_times = {
-            CareUrgency.EMERGENCY: "Immediate",
-            CareUrgency.URGENT: "2-4 hours",
-            CareUrgency.PROMPT: "24-48 hours",
-            CareUrgency.ROUTINE: "1-2 weeks",
-            CareUrgency.SELF_CARE: "N/A"
-        }
-
-        return wait_times.get(care_rec.urgency)
+        return ESTIMATED_WAIT_TIMES.get(care_rec.urgency)
 
     def _calculate_confidence(
         self,
@@ -830,6 +830,13 @@ async def chat_with_ai_advisor(
             detail="AI health advisor agent is not enabled for this tenant",
         )
 
+    # Deferred responses are delivered to an in-process callback, which HTTP callers cannot receive
+    if request.deferred:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Deferred advisor requests are only accepted from background workflows",
+        )
+
     logger.info(
         "executing_ai_health_advisor_agent",
         user_id=current_user.user_id,
@@ -18,6 +18,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from structlog import get_logger
 
 from ..config import get_config
+from ..shared_services.background_tasks import drain_background_tasks
+from ..shared_services.http_client import close_shared_http_client
 from ..shared_services.tenant_middleware import TenantRoutingMiddleware
 from ..tenant_management.api_router import router as tenant_router
 from ..tenant_management.db_service import TenantDBService
@@ -25,6 +27,9 @@ from ..tenant_management.db_service import TenantDBService
 config = get_config()
 logger = get_logger()
 
+# Longest wait for background tasks on shutdown before they are cancelled
+BACKGROUND_DRAIN_TIMEOUT_SECONDS = 30
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -50,7 +55,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("shutting_down_platform")
+    # Let pending background tasks finish while the clients they use are still open
+    await drain_background_tasks(timeout=BACKGROUND_DRAIN_TIMEOUT_SECONDS)
     app.state.mongo_client.close()
+    await close_shared_http_client()
     logger.info("platform_shutdown_complete")
 
 
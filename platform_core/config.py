@@ -89,6 +89,7 @@ class PlatformConfig(BaseSettings):
     agent_max_retries: int = Field(default=3)
     agent_timeout_seconds: int = Field(default=300)
     agent_confidence_threshold: float = Field(default=0.85)
+    llm_max_concurrency: int = Field(default=16, description="Max concurrent LLM calls per provider")
 
     # Audit & Logging
     log_level: str = Field(default="INFO")
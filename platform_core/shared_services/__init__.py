@@ -4,6 +4,9 @@ Shared Services Module
 Common services used across the platform including auth, database routing, and utilities.
 """
 
+from .keyword_scanner import KeywordScanner
+from .llm_batch_queue import BatchedLLMQueue
+from .semantic_cache import SemanticCache
 from .tenant_context import TenantContext, get_tenant_context
 
-__all__ = ["TenantContext", "get_tenant_context"]
+__all__ = ["BatchedLLMQueue", "KeywordScanner", "SemanticCache", "TenantContext", "get_tenant_context"]
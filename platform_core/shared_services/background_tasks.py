@@ -0,0 +1,63 @@
+"""
+Background Tasks
+
+Process-wide registry for fire-and-forget tasks (agent side effects, LLM batch
+flushing and polling). The event loop only keeps weak references to tasks, so
+tasks are held here until they finish; the application drains them on shutdown
+while the shared clients they use are still open.
+"""
+
+import asyncio
+from typing import Any, Coroutine, Optional
+
+from structlog import get_logger
+
+logger = get_logger()
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any], name: Optional[str] = None) -> asyncio.Task:
+    """
+    Schedule a coroutine without awaiting it.
+
+    Args:
+        coro: Coroutine to run
+        name: Task name for logging (defaults to the coroutine's qualified name)
+
+    Returns:
+        Scheduled task
+    """
+    task = asyncio.create_task(coro, name=name or getattr(coro, "__qualname__", None))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    task.add_done_callback(_log_background_failure)
+    return task
+
+
+def _log_background_failure(task: asyncio.Task) -> None:
+    """Log a failed background task (nothing else awaits these tasks)."""
+    if task.cancelled():
+        return
+
+    error = task.exception()
+    if error is not None:
+        logger.error("background_task_failed", task=task.get_name(), error=str(error), exc_info=error)
+
+
+async def drain_background_tasks(timeout: Optional[float] = None) -> None:
+    """
+    Wait for background tasks to finish (call on application shutdown).
+
+    Tasks scheduled while draining are waited for as well. Tasks still running
+    after timeout seconds are cancelled.
+
+    Args:
+        timeout: Maximum seconds to wait (None waits indefinitely)
+    """
+    try:
+        async with asyncio.timeout(timeout):
+            while _background_tasks:
+                await asyncio.gather(*_background_tasks, return_exceptions=True)
+    except TimeoutError:
+        logger.warning("background_tasks_drain_timeout", timeout=timeout)
@@ -0,0 +1,41 @@
+"""
+Shared HTTP Client
+
+Process-wide httpx.AsyncClient used underneath the LLM SDK clients so that
+concurrent agent executions share one connection pool and multiplex requests
+over HTTP/2 instead of paying a TLS handshake per client.
+"""
+
+from typing import Optional
+
+import httpx
+
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use.
+
+    Returns:
+        Shared async HTTP client
+    """
+    global _shared_http_client
+
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0,
+        )
+
+    return _shared_http_client
+
+
+async def close_shared_http_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _shared_http_client
+
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
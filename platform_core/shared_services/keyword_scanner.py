@@ -0,0 +1,165 @@
+"""
+Keyword Scanner
+
+Multi-pattern substring search used by agents that screen patient messages
+for crisis, safety and sentiment keywords. All keywords are found in a single
+pass over the text instead of one substring search per keyword.
+
+Uses a Hyperscan database (SIMD-accelerated multi-literal matching) when
+hyperscan is installed, else an Aho-Corasick automaton (pyahocorasick) when
+that is installed (both via the ``keyword-scan`` extra); otherwise falls back
+to a single precompiled regex alternation.
+
+Text that arrives in chunks (e.g. a streamed LLM response) can be scanned
+incrementally with KeywordScanner.stream().
+"""
+
+import re
+from collections.abc import Iterable
+from typing import Optional
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordScanner:
+    """
+    Finds which of a fixed set of keywords occur in a text.
+
+    Matching is exact and case-sensitive; callers normalize case first.
+    Overlapping keywords are all reported.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Initialize keyword scanner.
+
+        Args:
+            keywords: Keywords to search for
+        """
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self.max_keyword_length = max(map(len, self.keywords), default=0)
+
+        self._database = None
+        self._automaton = None
+        self._pattern: Optional[re.Pattern[str]] = None
+        self._prefixes: dict[str, tuple[str, ...]] = {}
+
+        if not self.keywords:
+            return
+
+        if hyperscan is not None:
+            # Hyperscan matches bytes; UTF-8 keeps substring matches identical to
+            # str matching, and every byte is escaped so keywords stay literal
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[
+                    "".join(f"\\x{byte:02x}" for byte in keyword.encode()).encode()
+                    for keyword in self.keywords
+                ],
+                ids=list(range(len(self.keywords))),
+                elements=len(self.keywords),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.keywords),
+            )
+            self._database = database
+        elif ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            # Zero-width lookahead tries every start position; longest keywords
+            # come first, and shorter keywords sharing that start are prefixes
+            # of the match, so they are added from the prefix table.
+            by_length = sorted(self.keywords, key=len, reverse=True)
+            self._pattern = re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in by_length) + "))")
+            self._prefixes = {
+                keyword: tuple(other for other in self.keywords if other != keyword and keyword.startswith(other))
+                for keyword in self.keywords
+            }
+
+    def scan(self, text: str) -> set[str]:
+        """
+        Find keywords occurring in text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Set of keywords found
+        """
+        if self._database is not None:
+            found = set()
+
+            def on_match(keyword_id: int, start: int, end: int, flags: int, context: object) -> None:
+                found.add(self.keywords[keyword_id])
+
+            self._database.scan(text.encode(), match_event_handler=on_match)
+            return found
+
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+
+        if self._pattern is None:
+            return set()
+
+        found = set()
+        for match in self._pattern.finditer(text):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._prefixes[keyword])
+
+        return found
+
+    def stream(self) -> "KeywordStreamScan":
+        """
+        Start an incremental scan over text that arrives in chunks.
+
+        Returns:
+            Scan state to feed chunks into
+        """
+        return KeywordStreamScan(self)
+
+
+class KeywordStreamScan:
+    """
+    Incremental keyword scan over chunked text.
+
+    Keeps the last few characters of the text seen so far, so keywords
+    spanning a chunk boundary are found.
+    """
+
+    def __init__(self, scanner: KeywordScanner):
+        """
+        Initialize incremental scan.
+
+        Args:
+            scanner: Scanner providing the keywords
+        """
+        self.scanner = scanner
+        self._overlap = max(scanner.max_keyword_length - 1, 0)
+        self._tail = ""
+
+    def feed(self, chunk: str) -> set[str]:
+        """
+        Scan the next chunk of text.
+
+        Args:
+            chunk: Next chunk of text
+
+        Returns:
+            Set of keywords ending in this chunk or in the few characters before it
+            (a keyword may be reported again by the following chunk)
+        """
+        text = self._tail + chunk
+        self._tail = text[-self._overlap:] if self._overlap else ""
+        return self.scanner.scan(text)
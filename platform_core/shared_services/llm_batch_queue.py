@@ -0,0 +1,155 @@
+"""
+Batched LLM Queue
+
+Accumulates non-realtime Anthropic Messages requests and submits them through
+the Message Batches API (client.beta.messages.batches), which is billed at a
+discount in exchange for asynchronous completion. Each submitted request gets
+a future that resolves with the response text once its batch has ended.
+
+Only use this for work nobody is waiting on interactively: batches may take
+minutes (up to 24 hours) to complete.
+"""
+
+import asyncio
+from itertools import count
+from typing import Any, Optional
+
+from structlog import get_logger
+
+from .background_tasks import run_in_background
+
+logger = get_logger()
+
+
+class BatchedLLMQueue:
+    """
+    Queue that groups Anthropic Messages requests into Message Batches.
+
+    A batch is submitted when ``max_batch_size`` requests are pending or
+    ``flush_interval_seconds`` after the first pending request, whichever
+    comes first.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_batch_size: int = 100,
+        flush_interval_seconds: float = 5.0,
+        poll_interval_seconds: float = 30.0,
+    ):
+        """
+        Initialize batched LLM queue.
+
+        Args:
+            client: AsyncAnthropic client
+            max_batch_size: Maximum requests per batch
+            flush_interval_seconds: Maximum time a request waits before its batch is submitted
+            poll_interval_seconds: Interval between batch status checks
+        """
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+
+        self._pending: list[tuple[str, dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._request_ids = count()
+
+    def enqueue(self, params: dict[str, Any], label: Optional[str] = None) -> tuple[str, asyncio.Future]:
+        """
+        Queue a Messages request without waiting for its batch.
+
+        Args:
+            params: Keyword arguments for messages.create (model, max_tokens, messages, ...)
+            label: Caller identifier for logging (e.g. conversation ID)
+
+        Returns:
+            Tuple of (request ID, future resolving with the text of the first content block)
+        """
+        future = asyncio.get_running_loop().create_future()
+        custom_id = f"req-{next(self._request_ids)}"
+        self._pending.append((custom_id, params, future))
+        logger.debug("llm_batch_request_queued", custom_id=custom_id, label=label)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._start_batch()
+        elif self._flush_task is None:
+            self._flush_task = run_in_background(self._flush_after_interval())
+
+        return custom_id, future
+
+    async def submit(self, params: dict[str, Any], label: Optional[str] = None) -> str:
+        """
+        Queue a Messages request and wait for its batch to complete.
+
+        Args:
+            params: Keyword arguments for messages.create (model, max_tokens, messages, ...)
+            label: Caller identifier for logging (e.g. conversation ID)
+
+        Returns:
+            Text of the first content block of the response
+        """
+        _, future = self.enqueue(params, label)
+        return await future
+
+    async def _flush_after_interval(self) -> None:
+        """Submit pending requests once the flush interval has elapsed."""
+        await asyncio.sleep(self.flush_interval_seconds)
+        self._flush_task = None
+        self._start_batch()
+
+    def _start_batch(self) -> None:
+        """Hand all pending requests to a new batch task."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        run_in_background(self._run_batch(pending))
+
+    async def _run_batch(self, pending: list[tuple[str, dict[str, Any], asyncio.Future]]) -> None:
+        """Submit a batch, wait for it to end and resolve each request's future."""
+        futures = {custom_id: future for custom_id, _, future in pending}
+
+        try:
+            batch = await self.client.beta.messages.batches.create(
+                requests=[{"custom_id": custom_id, "params": params} for custom_id, params, _ in pending]
+            )
+            logger.info("llm_batch_submitted", batch_id=batch.id, request_count=len(pending))
+
+            while batch.processing_status != "ended":
+                await asyncio.sleep(self.poll_interval_seconds)
+                batch = await self.client.beta.messages.batches.retrieve(batch.id)
+
+            async for entry in await self.client.beta.messages.batches.results(batch.id):
+                future = futures.pop(entry.custom_id, None)
+                if future is None or future.done():
+                    continue
+
+                if entry.result.type == "succeeded":
+                    future.set_result(entry.result.message.content[0].text)
+                else:
+                    future.set_exception(RuntimeError(f"Batch request {entry.result.type}"))
+
+            logger.info("llm_batch_completed", batch_id=batch.id)
+
+        except asyncio.CancelledError:
+            # Shutdown: the batch may still complete provider-side, but nobody will collect it
+            for future in futures.values():
+                future.cancel()
+            raise
+
+        except Exception as e:
+            logger.error("llm_batch_error", error=str(e), request_count=len(pending))
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Requests missing from the results
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Batch request missing from results"))
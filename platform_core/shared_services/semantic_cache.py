@@ -0,0 +1,234 @@
+"""
+Semantic Response Cache
+
+In-process cache for LLM responses keyed on a canonical request string.
+Near-duplicate requests (cosine similarity of their embeddings above a
+threshold) reuse a previously generated response instead of paying for
+another LLM call. Entries are partitioned by an exact-match scope so that
+responses are never shared across scopes (e.g. across patients); each scope
+has its own vector index, so lookups only ever search in-scope entries.
+
+Uses FAISS and sentence-transformers when they are installed (the
+``semantic-cache`` extra); otherwise the cache degrades to exact matching on
+the canonical key. Embedding runs in a worker thread so lookups never block
+the event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Optional
+
+from structlog import get_logger
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    faiss = None
+    np = None
+    SentenceTransformer = None
+
+logger = get_logger()
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Embeddings computed by a missed lookup, kept so the following store of the
+# same key does not encode it again
+EMBEDDING_MEMO_SIZE = 256
+
+
+@dataclass
+class _CacheEntry:
+    """Cached response with the key it was stored under."""
+
+    scope: str
+    key: str
+    value: str
+    stored_at: float
+    indexed: bool = False
+
+
+class SemanticCache:
+    """
+    LRU + TTL bounded cache with embedding similarity lookup.
+
+    Entries are evicted least-recently-used once ``max_entries`` is reached,
+    and ignored (and dropped) once older than ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            max_entries: Maximum number of cached responses
+            ttl_seconds: Time-to-live for cached responses
+            model_name: sentence-transformers model used for embeddings
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_name = model_name
+
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._ids_by_key: dict[tuple[str, str], int] = {}
+        self._next_id = count()
+
+        # Embedding backend is loaded lazily on first use
+        self._semantic_enabled = faiss is not None and SentenceTransformer is not None
+        self._model: Optional[Any] = None
+        self._model_lock = threading.Lock()
+        self._indexes: dict[str, Any] = {}
+        self._recent_embeddings: OrderedDict[str, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str, scope: str = "", exact: bool = False) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Canonical request key
+            scope: Partition the entry must belong to
+            exact: Only match the key exactly (skip the similarity search)
+
+        Returns:
+            Cached response, or None on miss
+        """
+        entry_id = self._ids_by_key.get((scope, key))
+
+        if entry_id is None and not exact and scope in self._indexes:
+            entry_id = await self._search(key, scope)
+
+        if entry_id is None:
+            return None
+
+        entry = self._entries[entry_id]
+        if time.monotonic() - entry.stored_at > self.ttl_seconds:
+            self._evict(entry_id)
+            return None
+
+        self._entries.move_to_end(entry_id)
+        return entry.value
+
+    async def set(self, key: str, value: str, scope: str = "", exact: bool = False) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Canonical request key
+            value: Response to cache
+            scope: Partition to store the entry in
+            exact: Only serve this entry to exact-key lookups (not indexed)
+        """
+        existing_id = self._ids_by_key.get((scope, key))
+        if existing_id is not None:
+            self._evict(existing_id)
+
+        while len(self._entries) >= self.max_entries:
+            oldest_id = next(iter(self._entries))
+            self._evict(oldest_id)
+
+        entry_id = next(self._next_id)
+        entry = _CacheEntry(scope=scope, key=key, value=value, stored_at=time.monotonic())
+        self._entries[entry_id] = entry
+        self._ids_by_key[(scope, key)] = entry_id
+
+        if self._semantic_enabled and not exact:
+            try:
+                embedding = self._recent_embeddings.pop(key, None)
+                if embedding is None:
+                    embedding = await asyncio.to_thread(self._embed, key)
+            except Exception as e:
+                # Exact matching still works for this entry
+                logger.warning("semantic_cache_index_failed", error=str(e))
+                return
+
+            # The entry may have been evicted while the embedding was computed
+            if self._entries.get(entry_id) is entry:
+                self._get_index(scope).add_with_ids(embedding, np.array([entry_id], dtype=np.int64))
+                entry.indexed = True
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+        self._ids_by_key.clear()
+        self._recent_embeddings.clear()
+        self._indexes.clear()
+
+    async def _search(self, key: str, scope: str) -> Optional[int]:
+        """Return the ID of the most similar entry in scope above threshold."""
+        try:
+            embedding = await asyncio.to_thread(self._embed, key)
+            self._remember_embedding(key, embedding)
+        except Exception as e:
+            logger.warning("semantic_cache_search_failed", error=str(e))
+            return None
+
+        # The scope's last entry may have been evicted while embedding
+        index = self._indexes.get(scope)
+        if index is None:
+            return None
+
+        similarities, ids = index.search(embedding, 1)
+        if ids[0][0] < 0 or similarities[0][0] < self.similarity_threshold:
+            return None
+
+        return int(ids[0][0])
+
+    def _evict(self, entry_id: int) -> None:
+        """Remove an entry from the cache and the vector index."""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+
+        if self._ids_by_key.get((entry.scope, entry.key)) == entry_id:
+            del self._ids_by_key[(entry.scope, entry.key)]
+
+        if entry.indexed:
+            index = self._indexes[entry.scope]
+            index.remove_ids(np.array([entry_id], dtype=np.int64))
+            if index.ntotal == 0:
+                del self._indexes[entry.scope]
+
+    def _remember_embedding(self, key: str, embedding: Any) -> None:
+        """Keep a lookup's embedding for a following store of the same key."""
+        self._recent_embeddings[key] = embedding
+        self._recent_embeddings.move_to_end(key)
+        while len(self._recent_embeddings) > EMBEDDING_MEMO_SIZE:
+            self._recent_embeddings.popitem(last=False)
+
+    def _get_model(self) -> Any:
+        """Load the embedding model once (called from worker threads)."""
+        with self._model_lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+            return self._model
+
+    def _embed(self, text: str) -> Any:
+        """Embed text as a normalized float32 row vector (blocking)."""
+        vector = self._get_model().encode([text], normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _get_index(self, scope: str) -> Any:
+        """Get or create the inner-product vector index for a scope."""
+        index = self._indexes.get(scope)
+        if index is None:
+            # The model is already loaded: an embedding precedes every index use
+            dimension = self._get_model().get_sentence_embedding_dimension()
+            index = self._indexes[scope] = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+
+        return index
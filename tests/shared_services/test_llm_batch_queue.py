@@ -0,0 +1,161 @@
+"""Tests for BatchedLLMQueue against a fake Anthropic Message Batches client."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from anthropic.types.beta.messages import BetaMessageBatch, BetaMessageBatchIndividualResponse
+
+from platform_core.shared_services.llm_batch_queue import BatchedLLMQueue
+
+
+def _batch(processing_status: str) -> BetaMessageBatch:
+    return BetaMessageBatch.model_validate(
+        {
+            "id": "msgbatch_1",
+            "type": "message_batch",
+            "processing_status": processing_status,
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2024-10-01T00:00:00Z",
+            "expires_at": "2024-10-02T00:00:00Z",
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "ended_at": None,
+            "results_url": None,
+        }
+    )
+
+
+def _succeeded(custom_id: str, text: str) -> BetaMessageBatchIndividualResponse:
+    return BetaMessageBatchIndividualResponse.model_validate(
+        {
+            "custom_id": custom_id,
+            "result": {
+                "type": "succeeded",
+                "message": {
+                    "id": "msg_1",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": "claude-3-5-sonnet-20241022",
+                    "content": [{"type": "text", "text": text}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 1, "output_tokens": 1},
+                },
+            },
+        }
+    )
+
+
+def _errored(custom_id: str) -> BetaMessageBatchIndividualResponse:
+    return BetaMessageBatchIndividualResponse.model_validate(
+        {
+            "custom_id": custom_id,
+            "result": {
+                "type": "errored",
+                "error": {"type": "error", "error": {"type": "api_error", "message": "boom"}},
+            },
+        }
+    )
+
+
+class FakeBatches:
+    """Stands in for client.beta.messages.batches."""
+
+    def __init__(self, polls_until_ended: int = 1):
+        self.polls_until_ended = polls_until_ended
+        self.created: list[list[dict]] = []
+        self.retrieved = 0
+
+    async def create(self, requests):
+        self.created.append(list(requests))
+        return _batch("in_progress")
+
+    async def retrieve(self, message_batch_id):
+        self.retrieved += 1
+        return _batch("ended" if self.retrieved >= self.polls_until_ended else "in_progress")
+
+    async def results(self, message_batch_id):
+        responses = []
+        for request in self.created[-1]:
+            text = request["params"]["messages"][0]["content"]
+            if text == "fail":
+                responses.append(_errored(request["custom_id"]))
+            elif text != "drop":
+                responses.append(_succeeded(request["custom_id"], f"echo: {text}"))
+
+        async def iterate():
+            for response in responses:
+                yield response
+
+        return iterate()
+
+
+def _queue(batches: FakeBatches, **kwargs) -> BatchedLLMQueue:
+    client = SimpleNamespace(beta=SimpleNamespace(messages=SimpleNamespace(batches=batches)))
+    return BatchedLLMQueue(client, poll_interval_seconds=0, **kwargs)
+
+
+def _params(text: str) -> dict:
+    return {"model": "claude-3-5-sonnet-20241022", "max_tokens": 10, "messages": [{"role": "user", "content": text}]}
+
+
+async def test_submit_polls_until_ended_and_resolves_each_request():
+    batches = FakeBatches(polls_until_ended=2)
+    queue = _queue(batches, max_batch_size=2)
+
+    results = await asyncio.gather(queue.submit(_params("one")), queue.submit(_params("two")))
+
+    assert results == ["echo: one", "echo: two"]
+    assert len(batches.created) == 1
+    assert batches.retrieved == 2
+
+
+async def test_pending_requests_flush_after_interval():
+    batches = FakeBatches()
+    queue = _queue(batches, max_batch_size=100, flush_interval_seconds=0.01)
+
+    assert await queue.submit(_params("solo")) == "echo: solo"
+    assert len(batches.created) == 1
+
+
+async def test_failed_and_missing_results_raise():
+    batches = FakeBatches()
+    queue = _queue(batches, max_batch_size=3)
+
+    results = await asyncio.gather(
+        queue.submit(_params("ok")),
+        queue.submit(_params("fail")),
+        queue.submit(_params("drop")),
+        return_exceptions=True,
+    )
+
+    assert results[0] == "echo: ok"
+    assert isinstance(results[1], RuntimeError) and "errored" in str(results[1])
+    assert isinstance(results[2], RuntimeError) and "missing" in str(results[2])
+
+
+async def test_client_error_fails_every_request():
+    batches = FakeBatches()
+
+    async def create(requests):
+        raise ConnectionError("down")
+
+    batches.create = create
+    queue = _queue(batches, max_batch_size=2)
+
+    with pytest.raises(ConnectionError):
+        await asyncio.gather(queue.submit(_params("one")), queue.submit(_params("two")))
+
+
+async def test_enqueue_returns_without_waiting_for_the_batch():
+    batches = FakeBatches()
+    queue = _queue(batches, max_batch_size=100, flush_interval_seconds=0.01)
+
+    first_id, first = queue.enqueue(_params("one"))
+    second_id, second = queue.enqueue(_params("two"))
+
+    assert first_id != second_id
+    assert not first.done() and not batches.created
+    assert await asyncio.gather(first, second) == ["echo: one", "echo: two"]
+    assert len(batches.created) == 1